@@ -0,0 +1,103 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from moments import moments
+
+# ------------------------------------------------------------------
+# Balayage de grilles de paramètres
+# ------------------------------------------------------------------
+# Chaque loi du catalogue reçoit une grille : {paramètre: liste de valeurs}.
+# Toutes les combinaisons (produit cartésien, G lignes) sont tirées d'un
+# coup : les paramètres deviennent des colonnes (G, 1) et un seul appel
+# loi.rvs(size=(G, size)) donne un échantillon par ligne (diffusion numpy).
+# Les moments exacts viennent d'un seul appel loi.stats(...) sur les mêmes
+# colonnes. Les lois qui ne sont pas des lois de scipy.stats (ZipfMandelbrot,
+# Dirac, fonctions) sont tirées combinaison par combinaison.
+#
+# Les lignes de la grille sont traitées par paquets de taille_bloc valeurs
+# tirées au plus ; chaque loi a sa graine (SeedSequence(graine).spawn).
+
+TAILLE_BLOC = 10_000_000
+
+
+def combinaisons(grille: dict) -> dict:
+    """{'n': [10, 20], 'p': [0.1, 0.5]} -> {'n': array([10, 10, 20, 20]), 'p': array([0.1, 0.5, 0.1, 0.5])}."""
+    noms = list(grille)
+    produit = list(itertools.product(*(np.atleast_1d(grille[nom]) for nom in noms)))
+    return {nom: np.array([ligne[i] for ligne in produit]) for i, nom in enumerate(noms)}
+
+
+def _diffusable(loi) -> bool:
+    """Vrai pour une loi de scipy.stats : paramètres tableaux et size=(G, size) acceptés."""
+    return isinstance(loi, (stats.rv_continuous, stats.rv_discrete))
+
+
+def _tirer(loi, colonnes, size, rng):
+    """Échantillons (G, size), un par ligne de 'colonnes'."""
+    nb = len(next(iter(colonnes.values()))) if colonnes else 1
+    if _diffusable(loi):
+        return loi.rvs(size=(nb, size), random_state=rng, **{k: v[:, None] for k, v in colonnes.items()})
+    lignes = [{k: v[i].item() for k, v in colonnes.items()} for i in range(nb)]
+    if hasattr(loi, "rvs"):
+        return np.stack([np.asarray(loi.rvs(size=size, random_state=rng, **p)) for p in lignes])
+    return np.stack([np.asarray(loi(size=size, **p)) for p in lignes])
+
+
+def _moments_exacts(loi, colonnes):
+    """(moyennes, variances) exactes de chaque ligne, nan si la loi n'a pas de stats."""
+    nb = len(next(iter(colonnes.values()))) if colonnes else 1
+    if _diffusable(loi):
+        moyenne, variance = loi.stats(moments="mv", **colonnes)
+        return np.broadcast_to(moyenne, nb).astype(float), np.broadcast_to(variance, nb).astype(float)
+    resultats = [moments(loi, {k: v[i].item() for k, v in colonnes.items()}) for i in range(nb)]
+    resultats = [r if r is not None else (np.nan, np.nan) for r in resultats]
+    return np.array([r[0] for r in resultats]), np.array([r[1] for r in resultats])
+
+
+def balayer(distributions: dict, size: int = 1000, graine: int = 0, taille_bloc: int = TAILLE_BLOC) -> pd.DataFrame:
+    """
+    Évalue toutes les combinaisons de paramètres de chaque loi.
+
+    distributions : {nom: (loi, grille)}, grille = {paramètre: valeur ou liste de valeurs}
+                    (un dictionnaire de valeurs seules = une combinaison, comme
+                    discrete_distributions / continuous_distributions)
+    size : taille de l'échantillon de chaque combinaison
+
+    Retourne un tableau « long », une ligne par (loi, combinaison) : distribution,
+    une colonne par paramètre (vide si la loi ne l'a pas), taille, moyenne et
+    ecart_type exacts, moyenne_echantillon, ecart_type_echantillon, minimum, maximum.
+    """
+    graines = np.random.SeedSequence(graine).spawn(len(distributions))
+    tableaux = []
+    for (nom, (loi, grille)), g in zip(distributions.items(), graines):
+        rng = np.random.default_rng(g)
+        colonnes = combinaisons(grille)
+        moyenne, variance = _moments_exacts(loi, colonnes)
+
+        nb = len(moyenne)
+        par_paquet = max(1, taille_bloc // max(size, 1))
+        resume = {"moyenne_echantillon": [], "ecart_type_echantillon": [], "minimum": [], "maximum": []}
+        for debut in range(0, nb, par_paquet):
+            paquet = {k: v[debut:debut + par_paquet] for k, v in colonnes.items()}
+            echantillons = _tirer(loi, paquet, size, rng)
+            resume["moyenne_echantillon"].append(echantillons.mean(axis=1))
+            resume["ecart_type_echantillon"].append(echantillons.std(axis=1))
+            resume["minimum"].append(echantillons.min(axis=1))
+            resume["maximum"].append(echantillons.max(axis=1))
+
+        tableaux.append(pd.DataFrame({
+            "distribution": nom,
+            **colonnes,
+            "taille": size,
+            "moyenne": moyenne,
+            "ecart_type": np.sqrt(variance),
+            **{cle: np.concatenate(valeurs) for cle, valeurs in resume.items()},
+        }, index=pd.RangeIndex(nb)))
+
+    tableau = pd.concat(tableaux, ignore_index=True)
+    # Colonnes de paramètres entre 'distribution' et 'taille', dans l'ordre d'apparition
+    fin = ["taille", "moyenne", "ecart_type", "moyenne_echantillon", "ecart_type_echantillon", "minimum", "maximum"]
+    return tableau[[c for c in tableau.columns if c not in fin] + fin]
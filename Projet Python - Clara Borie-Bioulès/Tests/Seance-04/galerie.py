@@ -0,0 +1,97 @@
+import os
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from histogramme import histogramme_distribution
+from moments import moyenne_ecart_type
+
+# Pool de processus commun (../processus.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from processus import executer_en_parallele
+
+# ------------------------------------------------------------------
+# Galerie des distributions, sans affichage
+# ------------------------------------------------------------------
+# Chaque distribution du catalogue (nom -> (loi, paramètres), comme
+# discrete_distributions / continuous_distributions dans main.py) est
+# traitée dans un processus : tirage de l'échantillon par blocs et comptage
+# des classes (histogramme.py), histogramme dessiné hors écran
+# (matplotlib.figure.Figure, moteur Agg) et enregistré en PNG et / ou SVG.
+# Les moyennes et écarts types (exacts si la loi a une méthode stats,
+# voir moments.py, sinon ceux de l'échantillon) vont dans un seul CSV.
+#
+# Chaque distribution a sa graine (SeedSequence(graine).spawn) : la
+# galerie est la même quel que soit le nombre de processus.
+
+FORMATS = ("png", "svg")
+
+
+def nom_de_fichier(nom: str) -> str:
+    """'Binomiale (n=10, p=0.5)' -> 'binomiale_n_10_p_0_5'."""
+    ascii_ = unicodedata.normalize("NFKD", nom).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "_", ascii_.lower()).strip("_") or "distribution"
+
+
+def dessiner_histogramme(bords, densites, titre, chemins, mean, std):
+    """Histogramme de densité (classes déjà comptées) enregistré dans chaque chemin."""
+    figure = Figure(figsize=(6, 4))
+    ax = figure.subplots()
+    ax.hist(bords[:-1], bins=bords, weights=densites, alpha=0.7, color='skyblue', edgecolor='black')
+    ax.set_title(f"{titre}\nMoyenne = {mean:.2f}, Écart type = {std:.2f}")
+    ax.set_xlabel("Valeurs")
+    ax.set_ylabel("Densité")
+    figure.tight_layout()
+    for chemin in chemins:
+        figure.savefig(chemin)
+
+
+def _rendre(tache):
+    nom, fichier, distribution, params, size, graine, dossier, formats = tache
+    # Échantillon tiré par blocs et résumé en classes (histogramme.py), comme plot_distribution
+    histogramme = histogramme_distribution(distribution, params, size, random_state=np.random.default_rng(graine))
+    exacts = moyenne_ecart_type(distribution, params)
+    mean, std = exacts if exacts is not None else (float(histogramme.moyenne), histogramme.ecart_type)
+
+    chemins = [Path(dossier) / f"{fichier}.{fmt}" for fmt in formats]
+    dessiner_histogramme(*histogramme.classes(), nom, chemins, mean, std)
+    return {"distribution": nom, "moyenne": mean, "ecart_type": std,
+            "fichiers": ";".join(str(c) for c in chemins)}
+
+
+def rendre_galerie(distributions: dict, dossier, formats=("png",), size: int = 1000,
+                   graine: int = 0, nb_travailleurs: int = None) -> pd.DataFrame:
+    """
+    Dessine toutes les distributions de 'distributions' dans 'dossier'
+    (un fichier par distribution et par format) et écrit dossier/resume.csv
+    (distribution, moyenne, ecart_type, fichiers).
+
+    Les lois doivent pouvoir être envoyées à un processus (pas de lambda).
+    """
+    inconnus = set(formats) - set(FORMATS)
+    if inconnus:
+        raise ValueError(f"Format inconnu : {', '.join(sorted(inconnus))} (attendu : {', '.join(FORMATS)})")
+    dossier = Path(dossier)
+    dossier.mkdir(parents=True, exist_ok=True)
+
+    # Noms de fichiers distincts, même si deux titres donnent le même nom
+    fichiers, vus = [], {}
+    for nom in distributions:
+        base = nom_de_fichier(nom)
+        vus[base] = vus.get(base, 0) + 1
+        fichiers.append(base if vus[base] == 1 else f"{base}_{vus[base]}")
+
+    graines = np.random.SeedSequence(graine).spawn(len(distributions))
+    taches = [(nom, fichier, loi, params, size, g, dossier, tuple(formats))
+              for (nom, (loi, params)), fichier, g in zip(distributions.items(), fichiers, graines)]
+
+    resultats = executer_en_parallele(_rendre, taches, nb_travailleurs)
+
+    resume = pd.DataFrame(resultats)
+    resume.to_csv(dossier / "resume.csv", index=False)
+    return resume
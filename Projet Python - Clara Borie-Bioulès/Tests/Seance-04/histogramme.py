@@ -0,0 +1,157 @@
+import numpy as np
+
+# ------------------------------------------------------------------
+# Histogramme calculé par blocs (sans garder l'échantillon)
+# ------------------------------------------------------------------
+# L'échantillon est tiré par blocs de taille_bloc valeurs ; chaque bloc
+# met à jour :
+#   - les effectifs des classes : np.bincount pour les lois discrètes
+#     (valeurs entières, une classe par valeur, regroupées à la fin par
+#     paquets d'entiers consécutifs si elles sont plus de nb_classes),
+#     np.histogram sinon ;
+#   - l'effectif, la moyenne et M2 (formule de Chan / Welford par blocs),
+#     d'où la moyenne et l'écart type, dans la même passe.
+# Pour une loi continue, on compte sur une grille fine (FINESSE sous-classes
+# par classe) fixée par le premier bloc, entre son minimum et son maximum ;
+# si un bloc suivant sort de la plage, la largeur des sous-classes double
+# (fusion deux à deux) jusqu'à le contenir. À la fin, les sous-classes non
+# vides sont regroupées en nb_classes classes au plus : sur un seul bloc, on
+# retrouve les classes de plt.hist(data, bins=nb_classes).
+
+TAILLE_BLOC = 1_000_000
+FINESSE = 8  # sous-classes par classe (loi continue)
+
+
+def tirer_par_blocs(distribution, params=None, size=1000, taille_bloc=TAILLE_BLOC, random_state=None):
+    """
+    Génère l'échantillon par blocs : loi scipy.stats (ou objet avec .rvs)
+    ou fonction prenant size en argument, comme plot_distribution.
+    """
+    params = params or {}
+    for debut in range(0, size, taille_bloc):
+        taille = min(taille_bloc, size - debut)
+        if hasattr(distribution, "rvs"):
+            yield np.asarray(distribution.rvs(size=taille, random_state=random_state, **params))
+        else:
+            yield np.asarray(distribution(size=taille, **params))
+
+
+class HistogrammeEnLigne:
+    """Effectifs par classe, moyenne et écart type mis à jour bloc par bloc."""
+
+    def __init__(self, nb_classes=30, discret=None):
+        self.nb_classes = nb_classes
+        self.discret = discret  # None : décidé au premier bloc (valeurs entières ou non)
+        self.n = 0
+        self.moyenne = 0.0
+        self.m2 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.effectifs = None
+        self.origine = None  # bord gauche de la première classe
+        self.largeur = None  # largeur des (sous-)classes
+
+    def ajouter(self, bloc):
+        bloc = np.asarray(bloc).ravel()
+        if bloc.size == 0:
+            return self
+        if self.discret is None:
+            self.discret = bloc.dtype.kind in "iub"
+
+        # Moments (fusion du bloc avec le résumé courant)
+        nb = bloc.size
+        moyenne_bloc = bloc.mean(dtype=float)
+        m2_bloc = float(((bloc - moyenne_bloc) ** 2).sum())
+        total = self.n + nb
+        delta = moyenne_bloc - self.moyenne
+        self.moyenne += delta * nb / total
+        self.m2 += m2_bloc + delta ** 2 * self.n * nb / total
+        self.n = total
+        mini, maxi = bloc.min(), bloc.max()
+        self.minimum = min(self.minimum, mini)
+        self.maximum = max(self.maximum, maxi)
+
+        if self.discret:
+            self._ajouter_discret(bloc.astype(np.int64), int(mini))
+        else:
+            self._ajouter_continu(bloc, float(mini), float(maxi))
+        return self
+
+    def _ajouter_discret(self, bloc, mini):
+        # Une classe par valeur entière, de self.origine à self.origine + len - 1
+        if self.effectifs is None:
+            self.origine, self.largeur = mini, 1
+            self.effectifs = np.zeros(0, dtype=np.int64)
+        if mini < self.origine:
+            self.effectifs = np.concatenate((np.zeros(self.origine - mini, dtype=np.int64), self.effectifs))
+            self.origine = mini
+        comptes = np.bincount(bloc - self.origine)
+        if len(comptes) > len(self.effectifs):
+            self.effectifs = np.concatenate(
+                (self.effectifs, np.zeros(len(comptes) - len(self.effectifs), dtype=np.int64))
+            )
+        self.effectifs[:len(comptes)] += comptes
+
+    def _ajouter_continu(self, bloc, mini, maxi):
+        k = self.nb_classes * FINESSE  # nombre pair : fusion deux à deux
+        if self.effectifs is None:
+            self.origine = mini
+            self.largeur = (maxi - mini) / k if maxi > mini else 1.0
+            self.effectifs = np.zeros(k, dtype=np.int64)
+            if maxi == mini:
+                self.origine = mini - 0.5 - k // 2  # valeur constante : au milieu d'une classe de largeur 1
+            while self.origine + k * self.largeur < maxi:  # arrondi : le maximum doit rester dans la plage
+                self.largeur = np.nextafter(self.largeur, np.inf)
+
+        # Élargit la plage (classes deux fois plus larges) tant que le bloc déborde
+        while mini < self.origine or maxi > self.origine + k * self.largeur:
+            fusion = self.effectifs.reshape(-1, 2).sum(axis=1)
+            self.effectifs = np.zeros(k, dtype=np.int64)
+            if mini < self.origine:
+                self.effectifs[k // 2:] = fusion  # extension vers la gauche
+                self.origine -= k * self.largeur
+            else:
+                self.effectifs[:k // 2] = fusion  # extension vers la droite
+            self.largeur *= 2
+
+        comptes, _ = np.histogram(bloc, bins=k, range=(self.origine, self.origine + k * self.largeur))
+        self.effectifs += comptes
+
+    @property
+    def ecart_type(self):
+        """Écart type (ddof=0, comme np.std)."""
+        return float(np.sqrt(self.m2 / self.n)) if self.n else np.nan
+
+    def classes(self):
+        """
+        Retourne (bords, densites) des classes entre le minimum et le maximum
+        observés : len(bords) = len(densites) + 1, densités comme density=True.
+        """
+        if self.discret:
+            # Valeurs entières regroupées par paquets de g si elles sont plus de nb_classes
+            effectifs, g = self._regrouper(self.effectifs)
+            bords = self.origine - 0.5 + g * np.arange(len(effectifs) + 1)
+        else:
+            # Sous-classes non vides regroupées par paquets de g : nb_classes classes au plus
+            non_vides = np.nonzero(self.effectifs)[0]
+            debut, fin = non_vides[0], non_vides[-1] + 1
+            effectifs, g = self._regrouper(self.effectifs[debut:fin])
+            bords = self.origine + self.largeur * (debut + g * np.arange(len(effectifs) + 1))
+        return bords, effectifs / (self.n * np.diff(bords))
+
+    def _regrouper(self, effectifs):
+        """Somme les effectifs par paquets de g consécutifs : (effectifs regroupés, g), nb_classes classes au plus."""
+        g = max(1, -(-len(effectifs) // self.nb_classes))
+        nb = -(-len(effectifs) // g)
+        paquets = np.zeros(nb * g, dtype=np.int64)
+        paquets[:len(effectifs)] = effectifs
+        return paquets.reshape(nb, g).sum(axis=1), g
+
+
+def histogramme_distribution(distribution, params=None, size=1000, nb_classes=30,
+                             taille_bloc=TAILLE_BLOC, random_state=None):
+    """Tire l'échantillon par blocs et renvoie son HistogrammeEnLigne."""
+    histogramme = HistogrammeEnLigne(nb_classes)
+    for bloc in tirer_par_blocs(distribution, params, size, taille_bloc, random_state):
+        histogramme.ajouter(bloc)
+    return histogramme
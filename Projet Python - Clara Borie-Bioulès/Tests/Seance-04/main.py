@@ -2,16 +2,33 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy import stats
 
-
-def moyenne(data):
-    return np.mean(data)
-
-
-def ecart_type(data):
-    return np.std(data)
-
-
-def plot_distribution(distribution, params=None, size=1000, title="Distribution"):
+from balayage import balayer
+from galerie import rendre_galerie
+from histogramme import TAILLE_BLOC, histogramme_distribution
+from moments import moyenne_ecart_type
+from zipf import ZipfMandelbrot
+
+# Galerie (galerie.py) : toutes les distributions dessinées en parallèle, hors
+# écran, et enregistrées dans DOSSIER_GALERIE (PNG / SVG) avec un resume.csv
+# des moyennes et écarts types, au lieu des fenêtres plt.show() une par une
+MODE_GALERIE = False
+DOSSIER_GALERIE = "galerie"
+FORMATS_GALERIE = ("png", "svg")
+
+# False : n'affiche que les moyennes et écarts types exacts (moments.py), sans
+# tirer d'échantillon ni ouvrir de fenêtre
+AFFICHER_HISTOGRAMMES = True
+
+# Balayage (balayage.py) : toutes les combinaisons des grilles de GRILLES_BALAYAGE
+# (définies plus bas) tirées d'un coup par loi, moments exacts et empiriques
+# réunis dans FICHIER_BALAYAGE
+MODE_BALAYAGE = False
+FICHIER_BALAYAGE = "balayage.csv"
+TAILLE_BALAYAGE = 1000
+
+
+def plot_distribution(distribution, params=None, size=1000, title="Distribution", taille_bloc=TAILLE_BLOC,
+                      histogramme=True):
     """
     Génère un histogramme pour une distribution donnée et calcule moyenne et écart type.
 
@@ -19,22 +36,32 @@ def plot_distribution(distribution, params=None, size=1000, title="Distribution"
     params : dictionnaire des paramètres de la distribution
     size : nombre de valeurs à générer
     title : titre de l'histogramme
-    """
-    if params is None:
-        params = {}
-
-    # Si c'est un objet scipy.stats (avec .rvs), on l'utilise pour générer les données
-    if hasattr(distribution, "rvs"):
-        data = distribution.rvs(size=size, **params)
-    else:
-        # Sinon on considère que c'est une fonction Python qui prend size en argument
-        data = distribution(size=size, **params)
+    taille_bloc : valeurs tirées par bloc (histogramme.py) ; l'échantillon n'est
+                  jamais gardé en entier, seuls les effectifs des classes le sont
+    histogramme : False pour ne calculer que la moyenne et l'écart type
 
-    mean = moyenne(data)
-    std = ecart_type(data)
+    Moyenne et écart type exacts (moments.py, gardés en cache) quand la loi a
+    une méthode stats ; sinon estimés sur l'échantillon. On ne tire un
+    échantillon que pour dessiner l'histogramme ou faute de moments exacts.
+    """
+    exacts = moyenne_ecart_type(distribution, params)
+    if exacts is not None and not histogramme:
+        return exacts
+
+    # Tirage par blocs : .rvs pour un objet scipy.stats, sinon fonction prenant size.
+    # Lois discrètes (valeurs entières) : une classe par valeur (np.bincount),
+    # 30 au plus (entiers consécutifs regroupés au-delà) ;
+    # continues : 30 classes, comme plt.hist(data, bins=30). Moyenne et écart
+    # type sont calculés dans la même passe.
+    classes = histogramme_distribution(distribution, params, size, taille_bloc=taille_bloc)
+    mean, std = exacts if exacts is not None else (classes.moyenne, classes.ecart_type)
+    if not histogramme:
+        return mean, std
+    bords, densites = classes.classes()
 
     plt.figure(figsize=(6, 4))
-    plt.hist(data, bins=30, density=True, alpha=0.7,
+    # Classes déjà comptées : une valeur par classe, pondérée par sa densité
+    plt.hist(bords[:-1], bins=bords, weights=densites, alpha=0.7,
              color='skyblue', edgecolor='black')
     plt.title(f"{title}\nMoyenne = {mean:.2f}, Écart type = {std:.2f}")
     plt.xlabel("Valeurs")
@@ -44,50 +71,41 @@ def plot_distribution(distribution, params=None, size=1000, title="Distribution"
     return mean, std
 
 
-print("Bienvenue dans le cours d'analyse de données en géographie !\n")
+# Loi de Zipf-Mandelbrot sur les rangs 1..1000 (zipf.py) : les tables de tirage
+# sont calculées une fois par (s, v, support), puis chaque tirage coûte O(1).
+# S'appelle comme une fonction, zipf_mandelbrot(size, s=2, v=1), ou via .rvs.
+zipf_mandelbrot = ZipfMandelbrot(s=2, v=1, support=1000)
+
+
+class Dirac:
+    """
+    Loi de Dirac en 'valeur' : rvs et stats comme une loi de scipy.stats
+    (classe nommée, et non lambda : elle peut être envoyée aux processus de la galerie).
+    """
+
+    def __init__(self, valeur=5):
+        self.valeur = valeur
+
+    def rvs(self, size=1, valeur=None, random_state=None):
+        return np.full(size, self.valeur if valeur is None else valeur)
+
+    def stats(self, valeur=None, moments="mv"):
+        moyenne = float(self.valeur if valeur is None else valeur)
+        return {"m": moyenne, "v": 0.0, "mv": (moyenne, 0.0)}[moments]
 
 
-def zipf_mandelbrot(size, s=2, v=1):
-    ranks = np.arange(1, size + 1)
-    probs = 1 / (ranks + v) ** s
-    probs /= probs.sum()
-    return np.random.choice(ranks, size=size, p=probs)
+dirac = Dirac(5)
 
 
 # Distributions discrètes
 discrete_distributions = {
-    "Dirac (tous égaux à 5)": (lambda size: np.full(size, 5), {}),
+    "Dirac (tous égaux à 5)": (dirac, {}),
     "Uniforme discrète 1-10": (stats.randint, {"low": 1, "high": 11}),
     "Binomiale (n=10, p=0.5)": (stats.binom, {"n": 10, "p": 0.5}),
     "Poisson (mu=3)": (stats.poisson, {"mu": 3}),
     "Zipf-Mandelbrot (s=2, v=1)": (zipf_mandelbrot, {"s": 2, "v": 1}),
 }
 
-for name, (dist, params) in discrete_distributions.items():
-    if callable(dist) and name.startswith("Dirac"):
-        # Cas particulier de la Dirac
-        data = dist(1000)
-        mean = moyenne(data)
-        std = ecart_type(data)
-
-        plt.figure(figsize=(6, 4))
-        plt.hist(
-            data,
-            bins=[4.5, 5.5],
-            density=True,
-            alpha=0.7,
-            color='skyblue',
-            edgecolor='black'
-        )
-        plt.title(f"{name}\nMoyenne = {mean:.2f}, Écart type = {std:.2f}")
-        plt.xlabel("Valeurs")
-        plt.ylabel("Densité")
-        plt.show()
-    else:
-        mean, std = plot_distribution(dist, params=params, title=name)
-
-    print(name, "=> Moyenne:", mean, ", Écart type:", std, "\n")
-
 
 # Distributions continues
 continuous_distributions = {
@@ -99,6 +117,45 @@ continuous_distributions = {
     "Pareto (b=2)": (stats.pareto, {"b": 2}),
 }
 
-for name, (dist, params) in continuous_distributions.items():
-    mean, std = plot_distribution(dist, params=params, title=name)
-    print(name, "=> Moyenne:", mean, ", Écart type:", std, "\n")
+
+# Grilles de paramètres : {nom: (loi, {paramètre: liste de valeurs})}
+GRILLES_BALAYAGE = {
+    "Binomiale": (stats.binom, {"n": [10, 20, 50], "p": [0.1, 0.3, 0.5, 0.7, 0.9]}),
+    "Poisson": (stats.poisson, {"mu": [1, 3, 5, 10]}),
+    "Zipf-Mandelbrot": (zipf_mandelbrot, {"s": [1.5, 2, 3], "v": [0, 1, 2]}),
+    "Normale": (stats.norm, {"loc": [0], "scale": [0.5, 1, 2]}),
+    "Log-Normale": (stats.lognorm, {"s": [0.25, 0.5, 1]}),
+    "Chi²": (stats.chi2, {"df": [1, 2, 4, 8]}),
+    "Pareto": (stats.pareto, {"b": [1.5, 2, 3, 4]}),
+}
+
+
+# Sous if __name__ : les processus de la galerie démarrés en spawn (Windows / macOS)
+# réimportent ce script et y retrouvent les lois, sans relancer le traitement
+if __name__ == "__main__":
+    print("Bienvenue dans le cours d'analyse de données en géographie !\n")
+
+    # Distributions discrètes
+    for name, (dist, params) in ({} if MODE_GALERIE else discrete_distributions).items():
+        # La Dirac (valeurs entières) tombe dans une seule classe [4.5, 5.5]
+        mean, std = plot_distribution(dist, params=params, title=name, histogramme=AFFICHER_HISTOGRAMMES)
+        print(name, "=> Moyenne:", mean, ", Écart type:", std, "\n")
+
+    # Distributions continues
+    for name, (dist, params) in ({} if MODE_GALERIE else continuous_distributions).items():
+        mean, std = plot_distribution(dist, params=params, title=name, histogramme=AFFICHER_HISTOGRAMMES)
+        print(name, "=> Moyenne:", mean, ", Écart type:", std, "\n")
+
+    if MODE_GALERIE:
+        resume = rendre_galerie(
+            {**discrete_distributions, **continuous_distributions},
+            DOSSIER_GALERIE, formats=FORMATS_GALERIE,
+        )
+        print(resume[["distribution", "moyenne", "ecart_type"]].to_string(index=False))
+        print(f"\nGalerie enregistrée dans : {DOSSIER_GALERIE}/")
+
+    if MODE_BALAYAGE:
+        balayage = balayer(GRILLES_BALAYAGE, size=TAILLE_BALAYAGE)
+        balayage.to_csv(FICHIER_BALAYAGE, index=False)
+        print(balayage.to_string(index=False))
+        print(f"\nBalayage enregistré dans : {FICHIER_BALAYAGE}")
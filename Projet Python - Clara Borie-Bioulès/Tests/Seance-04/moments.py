@@ -0,0 +1,44 @@
+from functools import lru_cache
+
+import numpy as np
+
+# ------------------------------------------------------------------
+# Moyenne et écart type exacts des lois, sans tirage
+# ------------------------------------------------------------------
+# Toute loi qui a une méthode stats(**params, moments="mv") (lois de
+# scipy.stats, figées ou non, ZipfMandelbrot, Dirac) donne sa moyenne et
+# sa variance exactes. Le résultat est gardé en cache par (loi, paramètres) :
+# un rapport qui repasse plusieurs fois sur les mêmes grilles ne recalcule
+# rien. Les lois sans stats (simple fonction de tirage) renvoient None et
+# doivent être estimées sur un échantillon.
+
+
+def _cle(params):
+    """Paramètres sous forme hachable : tuple trié de (nom, valeur)."""
+    return tuple(sorted((params or {}).items()))
+
+
+@lru_cache(maxsize=1024)
+def _moments(distribution, cle):
+    if not hasattr(distribution, "stats"):
+        return None
+    moyenne, variance = distribution.stats(**dict(cle), moments="mv")
+    return float(moyenne), float(variance)
+
+
+def moments(distribution, params=None):
+    """
+    Retourne (moyenne, variance) exacts de la loi pour ces paramètres,
+    ou None si la loi n'a pas de méthode stats. Variance infinie (ou nan)
+    si le moment n'existe pas (ex : Pareto avec b <= 2).
+    """
+    return _moments(distribution, _cle(params))
+
+
+def moyenne_ecart_type(distribution, params=None):
+    """(moyenne, écart type) exacts, ou None (voir moments)."""
+    resultat = moments(distribution, params)
+    if resultat is None:
+        return None
+    moyenne, variance = resultat
+    return moyenne, float(np.sqrt(variance))
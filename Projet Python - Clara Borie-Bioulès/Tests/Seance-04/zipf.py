@@ -0,0 +1,125 @@
+from functools import lru_cache
+
+import numpy as np
+
+# ------------------------------------------------------------------
+# Loi de Zipf-Mandelbrot sur un support fini {1, ..., support}
+# ------------------------------------------------------------------
+#     P(k) = (k + v)^(-s) / somme_j (j + v)^(-s)
+# Les tables de la loi (probabilités, fonction de répartition et table
+# d'alias de Walker / Vose) sont calculées une seule fois par
+# (s, v, support) et gardées en cache. Un tirage coûte ensuite O(1) par
+# valeur : un nombre uniforme, une case de la table et une comparaison.
+
+TAILLE_BLOC = 10_000_000  # valeurs tirées par bloc (limite les tableaux temporaires)
+
+
+@lru_cache(maxsize=32)
+def tables_zipf_mandelbrot(s: float, v: float, support: int) -> tuple:
+    """
+    Retourne (probabilites, repartition, seuils, alias) pour les rangs
+    1..support. Tableaux en lecture seule, partagés par le cache.
+    """
+    if support < 1:
+        raise ValueError(f"Le support doit contenir au moins un rang (reçu {support}).")
+    rangs = np.arange(1, support + 1, dtype=float)
+    poids = (rangs + v) ** -s
+    probabilites = poids / poids.sum()
+    repartition = np.cumsum(probabilites)
+    repartition[-1] = 1.0
+
+    # Table d'alias (méthode de Vose) : chaque case i garde le rang i avec
+    # la probabilité seuils[i], sinon renvoie alias[i]
+    reste = probabilites * support
+    seuils = np.ones(support)
+    alias = np.arange(support)
+    petits = np.flatnonzero(reste < 1.0)
+    grands = np.flatnonzero(reste >= 1.0)
+    if len(petits) and len(grands):
+        # Les grandes cases sont prises dans l'ordre, sans pile : sur l'axe des
+        # déficits des petites cases mis bout à bout, la grande case j comble
+        # celles qui commencent dans (excedents[j-1], excedents[j]], puis passe
+        # sous 1 et est comblée à son tour par la grande case j + 1
+        deficits = 1.0 - reste[petits]
+        fins = np.cumsum(deficits)
+        debuts = fins - deficits
+        excedents = np.cumsum(reste[grands] - 1.0)
+        donneurs = np.minimum(np.searchsorted(excedents, debuts, side="left"), len(grands) - 1)
+        seuils[petits] = reste[petits]
+        alias[petits] = grands[donneurs]
+        # Déficit de la grande case j : début de la première petite case qu'elle ne comble plus
+        suivantes = np.append(debuts, fins[-1])[np.searchsorted(debuts, excedents[:-1], side="right")]
+        seuils[grands[:-1]] = np.clip(1.0 - (suivantes - excedents[:-1]), 0.0, 1.0)
+        alias[grands[:-1]] = grands[1:]
+
+    for tableau in (probabilites, repartition, seuils, alias):
+        tableau.flags.writeable = False
+    return probabilites, repartition, seuils, alias
+
+
+def _generateur(random_state):
+    """Generator ou RandomState tel quel, sinon numpy.random.default_rng(random_state)."""
+    if isinstance(random_state, (np.random.Generator, np.random.RandomState)):
+        return random_state
+    return np.random.default_rng(random_state)
+
+
+class ZipfMandelbrot:
+    """
+    Loi de Zipf-Mandelbrot de paramètres s, v sur les rangs 1..support.
+
+    S'utilise comme une loi de scipy.stats dans plot_distribution
+    (méthode rvs, paramètres s / v / support passés en mots-clés) ou
+    comme une fonction : loi(size, s=2, v=1).
+    """
+
+    def __init__(self, s: float = 2, v: float = 1, support: int = 1000):
+        self.s = s
+        self.v = v
+        self.support = support
+
+    def _parametres(self, s, v, support) -> tuple:
+        return (float(self.s if s is None else s),
+                float(self.v if v is None else v),
+                int(self.support if support is None else support))
+
+    def tables(self, s=None, v=None, support=None) -> tuple:
+        return tables_zipf_mandelbrot(*self._parametres(s, v, support))
+
+    def pmf(self, k, s=None, v=None, support=None):
+        probabilites = self.tables(s, v, support)[0]
+        k = np.asarray(k)
+        dans_support = (k >= 1) & (k <= len(probabilites))
+        indices = np.where(dans_support, k, 1).astype(np.int64) - 1
+        return np.where(dans_support, probabilites[indices], 0.0)
+
+    def cdf(self, k, s=None, v=None, support=None):
+        repartition = self.tables(s, v, support)[1]
+        indices = np.clip(np.floor(np.asarray(k, dtype=float)), 0, len(repartition)).astype(np.int64)
+        return np.where(indices > 0, repartition[np.maximum(indices - 1, 0)], 0.0)
+
+    def stats(self, s=None, v=None, support=None, moments="mv"):
+        """Moyenne et variance exactes (somme finie sur le support), comme .stats() de scipy."""
+        probabilites = self.tables(s, v, support)[0]
+        rangs = np.arange(1, len(probabilites) + 1)
+        moyenne = float(probabilites @ rangs)
+        variance = float(probabilites @ (rangs - moyenne) ** 2)
+        return {"m": moyenne, "v": variance, "mv": (moyenne, variance)}[moments]
+
+    def rvs(self, size=1, s=None, v=None, support=None, random_state=None):
+        """Tire 'size' rangs (méthode de l'alias, par blocs de TAILLE_BLOC valeurs)."""
+        _, _, seuils, alias = self.tables(s, v, support)
+        rng = _generateur(random_state)
+        k = len(seuils)
+
+        forme = (size,) if np.isscalar(size) else tuple(size)
+        sortie = np.empty(int(np.prod(forme)), dtype=np.int64)
+        for debut in range(0, len(sortie), TAILLE_BLOC):
+            u = rng.random(min(TAILLE_BLOC, len(sortie) - debut)) * k
+            case = np.minimum(u.astype(np.int64), k - 1)
+            garder = (u - case) < seuils[case]
+            sortie[debut:debut + len(u)] = np.where(garder, case, alias[case]) + 1
+        return sortie.reshape(forme)
+
+    def __call__(self, size, s=None, v=None, support=None, random_state=None):
+        return self.rvs(size=size, s=s, v=v, support=support, random_state=random_state)
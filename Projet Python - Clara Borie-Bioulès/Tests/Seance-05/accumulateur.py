@@ -0,0 +1,124 @@
+# fichier : src/accumulateur.py
+
+
+import os
+import sys
+
+import numpy as np
+
+# Chargeur commun (../chargement.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from chargement import ouvrirUnFichier
+
+
+
+
+# --------------------------------------------------------------------
+# Statistiques par colonne en une seule passe
+# --------------------------------------------------------------------
+# Au lieu de garder toutes les valeurs de chaque colonne dans une liste
+# Python, on ne garde que : effectif, somme, moyenne, M2 (somme des carrés
+# des écarts à la moyenne, mise à jour à la Welford), minimum et maximum.
+# Les lignes arrivent par blocs : chaque bloc est résumé avec NumPy puis
+# fusionné avec le résumé courant (formule de Chan, forme par blocs de la
+# mise à jour de Welford).
+
+
+def convertir_bloc(lignes):
+   """
+   Convertit un bloc de lignes (listes de chaînes) en tableau d'entiers,
+   en enlevant les espaces et les virgules des grands nombres ("1 234", "1,234").
+   """
+   texte = np.array(lignes, dtype=str)
+   texte = np.char.replace(np.char.replace(texte, " ", ""), ",", "")
+   return texte.astype(np.int64)
+
+
+
+
+class AccumulateurColonnes:
+   """
+   Effectif, somme, moyenne, variance, minimum et maximum de chaque colonne,
+   mis à jour bloc par bloc sans conserver les valeurs.
+   """
+
+   def __init__(self, nb_colonnes=None):
+       self.n = 0
+       self.somme = None
+       self.moyenne = None
+       self.m2 = None
+       self.minimum = None
+       self.maximum = None
+       if nb_colonnes is not None:
+           self._initialiser(nb_colonnes)
+
+   def _initialiser(self, nb_colonnes):
+       self.somme = np.zeros(nb_colonnes, dtype=np.int64)
+       self.moyenne = np.zeros(nb_colonnes)
+       self.m2 = np.zeros(nb_colonnes)
+
+   def ajouter_bloc(self, bloc):
+       """Ajoute un bloc de lignes (tableau 2-D lignes x colonnes)."""
+       bloc = np.asarray(bloc)
+       if bloc.ndim == 1:
+           bloc = bloc[None, :]
+       nb = len(bloc)
+       if nb == 0:
+           return self
+       if self.somme is None:
+           self._initialiser(bloc.shape[1])
+
+       somme_bloc = bloc.sum(axis=0)
+       moyenne_bloc = somme_bloc / nb
+       m2_bloc = ((bloc - moyenne_bloc) ** 2).sum(axis=0)
+
+       # Fusion du résumé courant (n, moyenne, m2) et de celui du bloc
+       total = self.n + nb
+       delta = moyenne_bloc - self.moyenne
+       self.moyenne = self.moyenne + delta * (nb / total)
+       self.m2 = self.m2 + m2_bloc + delta ** 2 * (self.n * nb / total)
+       self.somme = self.somme + somme_bloc
+       if self.minimum is None:
+           self.minimum, self.maximum = bloc.min(axis=0), bloc.max(axis=0)
+       else:
+           self.minimum = np.minimum(self.minimum, bloc.min(axis=0))
+           self.maximum = np.maximum(self.maximum, bloc.max(axis=0))
+       self.n = total
+       return self
+
+   def ajouter_lignes(self, lignes):
+       """Ajoute un bloc de lignes lues avec csv.reader (listes de chaînes)."""
+       if len(lignes) == 0:
+           return self
+       return self.ajouter_bloc(convertir_bloc(lignes))
+
+   @property
+   def moyennes(self):
+       """Moyenne de chaque colonne (somme exacte / effectif, comme sum(col) / len(col))."""
+       return self.somme / self.n
+
+   def variances(self, ddof=1):
+       """Variance de chaque colonne (ddof=1 : variance corrigée)."""
+       if self.n - ddof <= 0:
+           return np.full_like(self.m2, np.nan)
+       return self.m2 / (self.n - ddof)
+
+   def ecarts_types(self, ddof=1):
+       return np.sqrt(self.variances(ddof))
+
+   def frequences(self):
+       """Part de chaque colonne dans le total (= moyenne / somme des moyennes)."""
+       return self.somme / self.somme.sum()
+
+
+
+
+def accumuler_fichier(chemin_fichier, taille_bloc=100_000):
+   """
+   Lit le fichier par blocs de lignes (sans jamais le garder en entier)
+   et renvoie l'AccumulateurColonnes de ses colonnes.
+   """
+   accumulateur = AccumulateurColonnes()
+   for lignes in ouvrirUnFichier(chemin_fichier, taille_bloc=taille_bloc, sortie="lignes"):
+       accumulateur.ajouter_lignes(lignes)
+   return accumulateur
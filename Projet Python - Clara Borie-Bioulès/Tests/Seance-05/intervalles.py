@@ -0,0 +1,110 @@
+# fichier : src/intervalles.py
+
+
+import numpy as np
+from scipy.stats import beta, norm
+
+
+
+
+# --------------------------------------------------------------------
+# Intervalles de confiance et de fluctuation pour tous les échantillons
+# --------------------------------------------------------------------
+# Les échantillons forment une matrice N x k (une ligne par échantillon,
+# une colonne par opinion) : les bornes de tous les échantillons et de
+# toutes les opinions sont calculées d'un coup, par diffusion NumPy.
+
+METHODES = ("wald", "wilson", "clopper-pearson")
+
+
+def _bornes(p, n, z, methode, x=None):
+   """
+   Bornes (inf, sup) pour une fréquence p sur n tirages (tableaux diffusés
+   l'un contre l'autre) ; x : nombre de succès (par défaut p * n).
+   """
+   p = np.asarray(p, dtype=float)
+   n = np.asarray(n, dtype=float)
+   if methode not in METHODES:
+       raise ValueError(f"Méthode inconnue : {methode} (attendu : {', '.join(METHODES)})")
+
+   with np.errstate(divide="ignore", invalid="ignore"):
+       if methode == "wald":
+           delta = z * np.sqrt(p * (1 - p) / n)
+           return p - delta, p + delta
+
+       if methode == "wilson":
+           z2 = z * z
+           denominateur = 1 + z2 / n
+           centre = (p + z2 / (2 * n)) / denominateur
+           delta = z / denominateur * np.sqrt(p * (1 - p) / n + z2 / (4 * n * n))
+           return centre - delta, centre + delta
+
+       # Clopper-Pearson (exact) : quantiles de lois bêta
+       x = p * n if x is None else np.asarray(x, dtype=float)
+       alpha = 2 * norm.sf(z)
+       borne_inf = np.where(x > 0, beta.ppf(alpha / 2, x, n - x + 1), 0.0)
+       borne_sup = np.where(x < n, beta.ppf(1 - alpha / 2, x + 1, n - x), 1.0)
+       return borne_inf, borne_sup
+
+
+
+
+def intervalles_confiance(effectifs, z=1.96, methode="wald"):
+   """
+   Intervalles de confiance des fréquences de chaque échantillon.
+
+   effectifs : matrice N x k (ou un seul échantillon de k effectifs)
+   Retourne (borne_inf, borne_sup), deux tableaux de même forme.
+   """
+   effectifs = np.asarray(effectifs, dtype=float)
+   n = effectifs.sum(axis=-1, keepdims=True)
+   with np.errstate(divide="ignore", invalid="ignore"):
+       p = effectifs / n
+   return _bornes(p, n, z, methode, x=effectifs)
+
+
+
+
+def intervalles_fluctuation(freq_population, n, z=1.96, methode="wald"):
+   """
+   Intervalles de fluctuation des fréquences de la population pour des
+   échantillons de taille n (nombre ou tableau de tailles : une ligne par taille).
+   """
+   p = np.asarray(freq_population, dtype=float)
+   n = np.asarray(n, dtype=float)[..., None]
+   return _bornes(p, n, z, methode)
+
+
+
+
+def bornes_par_effectif(n, z=1.96, methode="wald"):
+   """
+   Bornes de l'intervalle de confiance pour chaque nombre de succès
+   x = 0, 1, ..., n : table (n + 1) utilisée comme index quand de
+   nombreux échantillons ont la même taille n.
+   """
+   x = np.arange(n + 1, dtype=float)
+   return _bornes(x / n, n, z, methode, x=x)
+
+
+
+
+def taux_couverture(borne_inf, borne_sup, freq_reelles):
+   """
+   Part des échantillons dont l'intervalle contient la fréquence réelle :
+   retourne (taux par opinion, taux global).
+   """
+   freq_reelles = np.asarray(freq_reelles, dtype=float)
+   couvert = (borne_inf <= freq_reelles) & (freq_reelles <= borne_sup)
+   return couvert.mean(axis=0), float(couvert.mean())
+
+
+
+
+def frequences_population(chemin_fichier):
+   """
+   Fréquences réelles de la population à partir du fichier des effectifs
+   (une valeur par ligne, sans en-tête, ex. Echantillonnage-Population-reelle.csv).
+   """
+   effectifs = np.loadtxt(chemin_fichier, delimiter=",", ndmin=1)
+   return effectifs / effectifs.sum()
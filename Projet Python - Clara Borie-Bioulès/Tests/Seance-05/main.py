@@ -1,23 +1,19 @@
-import csv
-from math import sqrt
+import os
+import sys
 
-
-def ouvrirUnFichier(chemin):
-   with open(chemin, "r", encoding="utf-8") as f:
-       lecteur = csv.reader(f)
-       next(lecteur)  # saute la première ligne (en-tête)
-       return [row for row in lecteur]
+# Chargeur commun (../chargement.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from chargement import ouvrirUnFichier
+from accumulateur import AccumulateurColonnes, accumuler_fichier
+from intervalles import METHODES, frequences_population, intervalles_confiance, intervalles_fluctuation, taux_couverture
+from simulation import simuler_couverture
 
 
 def moyenne_colonnes(donnees):
-   nb_colonnes = len(donnees[0])
-   colonnes = [[] for _ in range(nb_colonnes)]
-   for row in donnees:
-       for i, val in enumerate(row):
-           # enlever les espaces et les éventuelles virgules dans les grands nombres
-           colonnes[i].append(int(val.replace(" ", "").replace(",", "")))
-   moyennes = [round(sum(col) / len(col)) for col in colonnes]
-   return moyennes
+   # Une seule passe : effectif, somme et M2 par colonne (accumulateur.py),
+   # sans garder les valeurs de chaque colonne dans une liste
+   accumulateur = AccumulateurColonnes().ajouter_lignes(donnees)
+   return [round(float(m)) for m in accumulateur.moyennes]
 
 
 def frequences(valeurs):
@@ -26,107 +22,146 @@ def frequences(valeurs):
 
 
 def intervalle_fluctuation(freq, n, z=1.96):
-   intervalles = []
-   for f in freq:
-       delta = z * sqrt(f * (1 - f) / n)
-       intervalles.append((round(f - delta, 2), round(f + delta, 2)))
-   return intervalles
+   # Toutes les fréquences d'un coup (intervalles.py)
+   borne_inf, borne_sup = intervalles_fluctuation(freq, n, z)
+   return [(round(float(a), 2), round(float(b), 2)) for a, b in zip(borne_inf, borne_sup)]
+
+
+# Sous if __name__ : les processus des pools (simulation.py, normalite.py)
+# démarrés en spawn (Windows / macOS) réimportent ce script sans le relancer
+if __name__ == "__main__":
+   # --- Main ---
+   # Le fichier est lu par blocs de lignes : seuls les résumés par colonne sont gardés
+   accumulateur = accumuler_fichier("data/Echantillonnage-100-Echantillons.csv")
+   moyennes = [round(float(m)) for m in accumulateur.moyennes]
+   freq_echantillon = frequences(moyennes)
+
+
+   # Population mère (à adapter selon ton exercice)
+   freq_population = [0.3, 0.5, 0.2]
+   n = sum(moyennes)
+
+
+   intervalles = intervalle_fluctuation(freq_population, n)
+
+
+   print("Moyennes par opinion :", moyennes)
+   print("Écarts types par opinion :", [round(float(e), 2) for e in accumulateur.ecarts_types()])
+   print("Minimum / maximum par opinion :", list(zip(accumulateur.minimum.tolist(), accumulateur.maximum.tolist())))
+   print("Fréquences de l'échantillon :", freq_echantillon)
+   print("Fréquences de la population mère :", freq_population)
+   print("Intervalles de fluctuation à 95% :", intervalles)
+
+
+   print("\nConclusion : Les fréquences de l'échantillon doivent se situer dans l'intervalle de fluctuation des fréquences de la population mère. Des écarts sont possibles à cause de la variabilité des échantillons.")
+
+   import pandas as pd
+
+
+   # Charger le fichier CSV
+   df = pd.read_csv("data/Echantillonnage-100-Echantillons.csv", sep=",")
+   print(df.head())  # Affiche les 5 premières lignes pour vérifier
+
+
+   # Sélection du premier échantillon
+   premier_echantillon = list(df.iloc[0].astype(int))
+   print("Premier échantillon :", premier_echantillon)
 
 
-# --- Main ---
-donnees = ouvrirUnFichier("data/Echantillonnage-100-Echantillons.csv")
-moyennes = moyenne_colonnes(donnees)
-freq_echantillon = frequences(moyennes)
+   # Taille totale de l'échantillon
+   taille_echantillon = sum(premier_echantillon)
 
 
-# Population mère (à adapter selon ton exercice)
-freq_population = [0.3, 0.5, 0.2]
-n = sum(moyennes)
+   # Fréquences de chaque opinion
+   frequences = [val / taille_echantillon for val in premier_echantillon]
+   print("Fréquences du premier échantillon :", frequences)
 
 
-intervalles = intervalle_fluctuation(freq_population, n)
+   z = 1.96
 
 
-print("Moyennes par opinion :", moyennes)
-print("Fréquences de l'échantillon :", freq_echantillon)
-print("Fréquences de la population mère :", freq_population)
-print("Intervalles de fluctuation à 95% :", intervalles)
+   # Intervalles de confiance de tous les échantillons et de toutes les opinions d'un coup
+   effectifs = df.to_numpy(dtype=float)
+   borne_inf, borne_sup = intervalles_confiance(effectifs, z)
+   ic = [(round(float(a), 2), round(float(b), 2)) for a, b in zip(borne_inf[0], borne_sup[0])]
 
 
-print("\nConclusion : Les fréquences de l'échantillon doivent se situer dans l'intervalle de fluctuation des fréquences de la population mère. Des écarts sont possibles à cause de la variabilité des échantillons.")
+   print("Intervalle de confiance à 95% :", ic)
 
-import pandas as pd
-import math
 
+   # Taux de couverture : part des échantillons dont l'intervalle contient la fréquence réelle
+   freq_reelles = frequences_population("data/Echantillonnage-Population-reelle.csv")
+   print("Fréquences réelles de la population :", [round(float(f), 4) for f in freq_reelles])
+   for methode in METHODES:
+       inf, sup = intervalles_confiance(effectifs, z, methode)
+       par_opinion, globale = taux_couverture(inf, sup, freq_reelles)
+       print(f"Couverture ({methode}) : {globale:.2%} - par opinion :", [round(float(t), 2) for t in par_opinion])
 
-# Charger le fichier CSV
-df = pd.read_csv("data/Echantillonnage-100-Echantillons.csv", sep=",")
-print(df.head())  # Affiche les 5 premières lignes pour vérifier
 
+   # Simulation (simulation.py) : échantillons multinomiaux tirés dans la population
+   # réelle, couverture des intervalles pour plusieurs tailles n et plusieurs z,
+   # dans un pool de processus
+   MODE_SIMULATION = False
 
-# Sélection du premier échantillon
-premier_echantillon = list(df.iloc[0].astype(int))
-print("Premier échantillon :", premier_echantillon)
 
+   if MODE_SIMULATION:
+       couverture_simulee = simuler_couverture(
+           freq_reelles, tailles=[100, 500, 1000, 5000], z_valeurs=[1.645, 1.96, 2.576],
+           nb_echantillons=100_000, opinions=list(df.columns),
+       )
+       couverture_simulee.to_csv("data/resultats_couverture_simulee.csv", index=False)
+       print("\nCouverture simulée (toutes les opinions à la fois) :")
+       print(couverture_simulee[couverture_simulee["opinion"] == "toutes"]
+             .pivot_table(index=["taille", "z"], columns="intervalle", values="couverture"))
 
-# Taille totale de l'échantillon
-taille_echantillon = sum(premier_echantillon)
+   import pandas as pd
+   import matplotlib.pyplot as plt
+   from scipy.stats import shapiro, probplot
+   from normalite import tester_normalite_par_lot
 
 
-# Fréquences de chaque opinion
-frequences = [val / taille_echantillon for val in premier_echantillon]
-print("Fréquences du premier échantillon :", frequences)
+   # --- Fichiers CSV ---
+   fichiers = ["data/Loi-normale-Test-1.csv", "data/Loi-normale-Test-2.csv"]
 
 
-z = 1.96
+   # Mode lot (normalite.py) : tests dans un pool de processus, un seul tableau
+   # récapitulatif, figures enregistrées hors écran au lieu de plt.show()
+   MODE_LOT = False
 
 
-ic = []
-for p in frequences:
-   ecart_type = math.sqrt(p * (1 - p) / taille_echantillon)
-   borne_inf = p - z * ecart_type
-   borne_sup = p + z * ecart_type
-   ic.append((round(borne_inf, 2), round(borne_sup, 2)))
+   if MODE_LOT:
+       resume_normalite = tester_normalite_par_lot(fichiers, dossier_figures="data/figures_normalite")
+       resume_normalite.to_csv("data/resultats_normalite.csv", index=False)
+       print(resume_normalite)
 
 
-print("Intervalle de confiance à 95% :", ic)
+   for fichier in ([] if MODE_LOT else fichiers):
+       # Lire le CSV (relu depuis le cache binaire data/.cache après le premier passage)
+       df = ouvrirUnFichier(fichier, cache=True)
 
-import pandas as pd
-import matplotlib.pyplot as plt
-from scipy.stats import shapiro, probplot
+       # Extraire la colonne (supposons qu'il n'y ait qu'une colonne de données)
+       valeurs = df.iloc[:, 0].dropna()
 
+       print(f"\nAnalyse pour {fichier} :")
 
-# --- Fichiers CSV ---
-fichiers = ["data/Loi-normale-Test-1.csv", "data/Loi-normale-Test-2.csv"]
+       # 1. Histogramme avec densité estimée
+       plt.figure(figsize=(8, 4))
+       plt.hist(valeurs, bins=20, density=True, alpha=0.6, color='g', edgecolor='black')
+       plt.title(f"Histogramme de {fichier}")
+       plt.xlabel("Valeurs")
+       plt.ylabel("Densité")
+       plt.show()
 
+       # 2. QQ-plot
+       plt.figure(figsize=(6, 6))
+       probplot(valeurs, dist="norm", plot=plt)
+       plt.title(f"QQ-plot de {fichier}")
+       plt.show()
 
-for fichier in fichiers:
-   # Lire le CSV
-   df = pd.read_csv(fichier)
-  
-   # Extraire la colonne (supposons qu'il n'y ait qu'une colonne de données)
-   valeurs = df.iloc[:, 0].dropna()
-  
-   print(f"\nAnalyse pour {fichier} :")
-  
-   # 1. Histogramme avec densité estimée
-   plt.figure(figsize=(8, 4))
-   plt.hist(valeurs, bins=20, density=True, alpha=0.6, color='g', edgecolor='black')
-   plt.title(f"Histogramme de {fichier}")
-   plt.xlabel("Valeurs")
-   plt.ylabel("Densité")
-   plt.show()
-  
-   # 2. QQ-plot
-   plt.figure(figsize=(6, 6))
-   probplot(valeurs, dist="norm", plot=plt)
-   plt.title(f"QQ-plot de {fichier}")
-   plt.show()
-  
-   # 3. Test de Shapiro-Wilk
-   stat, p = shapiro(valeurs)
-   print(f"Test de Shapiro-Wilk : Statistique = {stat:.4f}, p-value = {p:.4f}")
-   if p > 0.05:
-       print("→ Cette série peut être considérée comme suivant une loi normale.")
-   else:
-       print("→ Cette série ne suit pas une loi normale.")
\ No newline at end of file
+       # 3. Test de Shapiro-Wilk
+       stat, p = shapiro(valeurs)
+       print(f"Test de Shapiro-Wilk : Statistique = {stat:.4f}, p-value = {p:.4f}")
+       if p > 0.05:
+           print("→ Cette série peut être considérée comme suivant une loi normale.")
+       else:
+           print("→ Cette série ne suit pas une loi normale.")
@@ -0,0 +1,138 @@
+# fichier : src/normalite.py
+
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from scipy.stats import anderson, normaltest, probplot, shapiro
+
+# Chargeur et pool de processus communs (../chargement.py, ../processus.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from chargement import ouvrirUnFichier
+from processus import executer_en_parallele
+
+
+
+
+# --------------------------------------------------------------------
+# Tests de normalité par lot, sans affichage
+# --------------------------------------------------------------------
+# Chaque série (fichier CSV ou tableau de valeurs) est testée dans un
+# processus du pool : Shapiro-Wilk jusqu'à TAILLE_MAX_SHAPIRO valeurs,
+# au-delà D'Agostino-Pearson (ou Anderson-Darling). Les figures
+# (histogramme + QQ-plot) sont facultatives et dessinées hors écran
+# (matplotlib.figure.Figure, moteur Agg) : rien ne bloque le traitement.
+
+TAILLE_MAX_SHAPIRO = 5000
+REPLIS = ("dagostino", "anderson")
+
+
+def tester_normalite(valeurs, alpha=0.05, repli="dagostino", taille_max_shapiro=TAILLE_MAX_SHAPIRO):
+   """
+   Test de normalité d'une série : retourne test, n, statistique, p_value
+   et normale (True si on ne rejette pas la normalité au seuil alpha).
+
+   Anderson-Darling : p-value interpolée avec SciPy >= 1.17 ; avant, pas de
+   p-value et la décision se fait avec la valeur critique au seuil alpha le
+   plus proche (15, 10, 5, 2.5 ou 1 %).
+   """
+   if repli not in REPLIS:
+       raise ValueError(f"Repli inconnu : {repli} (attendu : {', '.join(REPLIS)})")
+   x = np.asarray(valeurs, dtype=float)
+   x = x[~np.isnan(x)]
+   n = len(x)
+   if n < 3:
+       return {"test": None, "n": n, "statistique": np.nan, "p_value": np.nan, "normale": None}
+
+   if n <= taille_max_shapiro:
+       test, (stat, p) = "shapiro", shapiro(x)
+   elif repli == "dagostino":
+       test, (stat, p) = "dagostino", normaltest(x)
+   else:
+       try:
+           res = anderson(x, dist="norm", method="interpolate")
+           test, stat, p = "anderson", res.statistic, res.pvalue
+       except TypeError:  # SciPy < 1.17 : valeurs critiques seulement
+           res = anderson(x, dist="norm")
+           niveaux = np.asarray(res.significance_level) / 100
+           critique = res.critical_values[np.argmin(np.abs(niveaux - alpha))]
+           return {"test": "anderson", "n": n, "statistique": float(res.statistic),
+                   "p_value": np.nan, "normale": bool(res.statistic < critique)}
+
+   return {"test": test, "n": n, "statistique": float(stat), "p_value": float(p), "normale": bool(p > alpha)}
+
+
+
+
+def dessiner_serie(valeurs, nom, chemin_image):
+   """Histogramme et QQ-plot d'une série, enregistrés dans chemin_image (sans affichage)."""
+   figure = Figure(figsize=(12, 5))
+   histogramme, qq = figure.subplots(1, 2)
+   histogramme.hist(valeurs, bins=20, density=True, alpha=0.6, color='g', edgecolor='black')
+   histogramme.set_title(f"Histogramme de {nom}")
+   histogramme.set_xlabel("Valeurs")
+   histogramme.set_ylabel("Densité")
+   probplot(valeurs, dist="norm", plot=qq)
+   qq.set_title(f"QQ-plot de {nom}")
+   figure.savefig(chemin_image)
+
+
+
+
+def _traiter_serie(tache):
+   nom, source, alpha, repli, dossier_figures = tache
+   if isinstance(source, (str, Path)):
+       # Première colonne du fichier, comme dans main.py
+       valeurs = ouvrirUnFichier(source).iloc[:, 0].to_numpy(dtype=float)
+   else:
+       valeurs = np.asarray(source, dtype=float)
+
+   resultat = {"serie": nom, **tester_normalite(valeurs, alpha, repli)}
+   if dossier_figures is not None:
+       valeurs = valeurs[~np.isnan(valeurs)]
+       chemin_image = Path(dossier_figures) / f"{Path(str(nom)).stem}.png"
+       dessiner_serie(valeurs, nom, chemin_image)
+       resultat["figure"] = str(chemin_image)
+   return resultat
+
+
+
+
+def _series(source):
+   """Liste de (nom, fichier ou valeurs) : dossier, liste de fichiers ou dictionnaire {nom: valeurs}."""
+   if isinstance(source, dict):
+       return list(source.items())
+   if isinstance(source, (str, Path)) and Path(source).is_dir():
+       return [(str(f), f) for f in sorted(Path(source).glob("*.csv"))]
+   if isinstance(source, (str, Path)):
+       source = [source]
+   return [(str(f), f) for f in source]
+
+
+
+
+def tester_normalite_par_lot(source, alpha=0.05, repli="dagostino", dossier_figures=None, nb_travailleurs=None):
+   """
+   Teste toutes les séries de 'source' (dossier de CSV, liste de fichiers
+   ou dictionnaire {nom: valeurs}) dans un pool de processus.
+
+   - dossier_figures : si donné, histogramme + QQ-plot de chaque série
+     enregistrés en PNG dans ce dossier
+   - nb_travailleurs : nombre de processus (1 : dans le processus courant)
+
+   Retourne le tableau récapitulatif (une ligne par série).
+   """
+   if repli not in REPLIS:
+       raise ValueError(f"Repli inconnu : {repli} (attendu : {', '.join(REPLIS)})")
+   if dossier_figures is not None:
+       Path(dossier_figures).mkdir(parents=True, exist_ok=True)
+   taches = [(nom, s, alpha, repli, dossier_figures) for nom, s in _series(source)]
+
+   nb_travailleurs = nb_travailleurs or os.cpu_count() or 1
+   resultats = executer_en_parallele(_traiter_serie, taches, nb_travailleurs,
+                                     chunksize=max(1, len(taches) // (4 * nb_travailleurs)))
+   return pd.DataFrame(resultats)
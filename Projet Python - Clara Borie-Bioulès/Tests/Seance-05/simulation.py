@@ -0,0 +1,113 @@
+# fichier : src/simulation.py
+
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from intervalles import METHODES, bornes_par_effectif, intervalles_fluctuation
+
+# Pool de processus commun (../processus.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from processus import executer_en_parallele
+
+
+
+
+# --------------------------------------------------------------------
+# Simulation de Monte-Carlo de la couverture des intervalles
+# --------------------------------------------------------------------
+# On tire des échantillons multinomiaux de taille n dans la population
+# réelle, par blocs de taille_bloc échantillons (un tableau taille_bloc x k
+# par tirage), et on compte :
+#   - "fluctuation" : les fréquences observées qui tombent dans l'intervalle
+#     de fluctuation de la population ;
+#   - "wald", "wilson", "clopper-pearson" : les intervalles de confiance
+#     des échantillons qui contiennent la fréquence réelle.
+#
+# Chaque bloc a son propre flux numpy.random.Generator, issu d'un
+# SeedSequence(graine).spawn(...) dans un ordre fixe : le résultat ne
+# dépend pas du nombre de processus utilisés.
+
+INTERVALLES = ("fluctuation",) + METHODES
+
+
+def _simuler_bloc(tache):
+   """Compte les échantillons couverts d'un bloc : tableau (nb_z, nb_intervalles, k + 1)."""
+   graine, n, nb, p, z_valeurs, intervalles = tache
+   rng = np.random.default_rng(graine)
+   effectifs = rng.multinomial(n, p, size=nb)  # nb x k
+   freq = effectifs / n
+   opinion = np.arange(len(p))
+
+   comptes = np.zeros((len(z_valeurs), len(intervalles), len(p) + 1), dtype=np.int64)
+   for i, z in enumerate(z_valeurs):
+       for j, intervalle in enumerate(intervalles):
+           if intervalle == "fluctuation":
+               borne_inf, borne_sup = intervalles_fluctuation(p, n, z)
+               couvert = (borne_inf <= freq) & (freq <= borne_sup)
+           else:
+               # Les bornes ne dépendent que de (x, n) : table pour x = 0..n,
+               # puis lecture dans la table pour chaque échantillon
+               borne_inf, borne_sup = bornes_par_effectif(n, z, intervalle)
+               table = (borne_inf[:, None] <= p) & (p <= borne_sup[:, None])  # (n + 1) x k
+               couvert = table[effectifs, opinion]
+           comptes[i, j, :-1] = couvert.sum(axis=0)
+           comptes[i, j, -1] = couvert.all(axis=1).sum()  # toutes les opinions à la fois
+   return comptes
+
+
+
+
+def simuler_couverture(freq_population, tailles, z_valeurs=(1.96,), nb_echantillons=1_000_000,
+                       intervalles=INTERVALLES, opinions=None, taille_bloc=100_000,
+                       graine=0, nb_travailleurs=None):
+   """
+   Taux de couverture simulés pour chaque taille d'échantillon n, chaque z
+   et chaque type d'intervalle.
+
+   - nb_travailleurs : nombre de processus (1 : tout dans le processus courant,
+     None : un par cœur)
+
+   Retourne un tableau « long » : taille, z, intervalle, opinion
+   ("toutes" : toutes les opinions couvertes à la fois), couverture, nb_echantillons.
+   """
+   p = np.asarray(freq_population, dtype=float)
+   p = p / p.sum()
+   tailles = [int(n) for n in tailles]
+   z_valeurs = [float(z) for z in z_valeurs]
+   intervalles = tuple(intervalles)
+   inconnus = set(intervalles) - set(INTERVALLES)
+   if inconnus:
+       raise ValueError(f"Intervalle inconnu : {', '.join(sorted(inconnus))} (attendu : {', '.join(INTERVALLES)})")
+   opinions = [str(i) for i in range(len(p))] if opinions is None else list(opinions)
+
+   # Découpage en blocs : une graine enfant par bloc, dans un ordre fixe
+   blocs = [(n, min(taille_bloc, nb_echantillons - debut))
+            for n in tailles for debut in range(0, nb_echantillons, taille_bloc)]
+   graines = np.random.SeedSequence(graine).spawn(len(blocs))
+   taches = [(g, n, nb, p, z_valeurs, intervalles) for g, (n, nb) in zip(graines, blocs)]
+
+   resultats = executer_en_parallele(_simuler_bloc, taches, nb_travailleurs)
+
+   # Somme des comptes des blocs de chaque taille
+   comptes = {n: 0 for n in tailles}
+   for (n, _), c in zip(blocs, resultats):
+       comptes[n] = comptes[n] + c
+
+   lignes = []
+   for n in tailles:
+       for i, z in enumerate(z_valeurs):
+           for j, intervalle in enumerate(intervalles):
+               for o, opinion in enumerate(opinions + ["toutes"]):
+                   lignes.append({
+                       "taille": n,
+                       "z": z,
+                       "intervalle": intervalle,
+                       "opinion": opinion,
+                       "couverture": comptes[n][i, j, o] / nb_echantillons,
+                       "nb_echantillons": nb_echantillons,
+                   })
+   return pd.DataFrame(lignes)
@@ -2,9 +2,16 @@
 
 
 import os
+import sys
 import pandas as pd
 from scipy.stats import spearmanr, kendalltau
 
+from rangs import classement_aligne, codes_categoriels, correlations_des_rangs
+
+# Chargeur commun (../chargement.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from chargement import ouvrirUnFichier
+
 
 
 
@@ -41,7 +48,6 @@ def bonus_iles():
    """
    base_dir = os.path.dirname(os.path.dirname(__file__))
    chemin_csv = os.path.join(base_dir, "data", "island-index.csv")
-   df = pd.read_csv(chemin_csv, low_memory=False)
 
 
    # Colonnes réelles utilisées dans le TP sur les îles
@@ -49,6 +55,10 @@ def bonus_iles():
    coast_col = "Trait de côte (km)"
 
 
+   # Seules les deux colonnes utiles sont lues
+   df = ouvrirUnFichier(chemin_csv, colonnes=[surf_col, coast_col])
+
+
    # On ne garde que les lignes où les deux colonnes sont valides
    df_sub = df[[surf_col, coast_col]].dropna().copy()
    df_sub[surf_col] = df_sub[surf_col].astype(float)
@@ -86,83 +96,66 @@ def ouvrir_un_fichier_etats():
    """Ouvre le fichier Le-Monde-HS-Etats-du-monde-2007-2025.csv."""
    base_dir = os.path.dirname(os.path.dirname(__file__))
    chemin_csv = os.path.join(base_dir, "data", "Le-Monde-HS-Etats-du-monde-2007-2025.csv")
-   df = pd.read_csv(chemin_csv)
+   df = ouvrirUnFichier(chemin_csv, cache=True)
    return df
 
 
 
 
-def ordrePopulation(liste_valeurs, liste_etats):
+def analyse_une_annee(df, annee, methode="ordinal"):
    """
-   Ordonne de manière décroissante la liste 'liste_valeurs'
-   en conservant la correspondance avec 'liste_etats'.
-
+   1) construit les classements par population et densité pour une année donnée,
+   2) fabrique les deux listes de rangs,
+   3) renvoie (rs, p_s, tau, p_k) pour cette année.
 
-   Retourne (valeurs_ordonnee, etats_ordonnes).
+   methode : traitement des ex aequo ("ordinal", "average", "min" ou "dense").
    """
-   couples = list(zip(liste_valeurs, liste_etats))
-   couples_triees = sorted(couples, key=lambda x: x[0], reverse=True)
-   valeurs_ord = [v for v, e in couples_triees]
-   etats_ord = [e for v, e in couples_triees]
-   return valeurs_ord, etats_ord
-
-
+   col_pop = f"Pop {annee}"
+   col_dens = f"Densité {annee}"
 
 
-def classementPays(etats_pop, etats_densite):
-   """
-   Prépare la comparaison de deux classements :
-   - etats_pop : liste d'États classés selon la population (ordre décroissant)
-   - etats_densite : liste d'États classés selon la densité (ordre décroissant)
+   # Classements alignés sur des codes d'États (rangs.py), sans tuples ni dictionnaires
+   codes, _ = codes_categoriels(df["État"])
+   pop = df[col_pop].to_numpy(dtype=float)
+   dens = df[col_dens].to_numpy(dtype=float)
 
 
-   Retour : liste de tuples (rang_pop, rang_dens) triés par rang_pop.
-   """
-   rang_pop = {etat: i + 1 for i, etat in enumerate(etats_pop)}
-   rang_dens = {etat: i + 1 for i, etat in enumerate(etats_densite)}
+   _, rang_pop, rang_dens = classement_aligne(codes, pop, codes, dens, methode=methode)
 
 
-   etats_communs = [e for e in etats_pop if e in rang_dens]
-   couples_rangs = [(rang_pop[e], rang_dens[e]) for e in etats_communs]
-   couples_rangs.sort(key=lambda x: x[0])
-   return couples_rangs
+   return analyse_rangs(rang_pop, rang_dens)
 
 
 
 
-def analyse_une_annee(df, annee):
+def analyse_toutes_annees(df, annees):
    """
-   1) construit les classements par population et densité pour une année donnée,
-   2) fabrique les deux listes de rangs,
-   3) renvoie (rs, p_s, tau, p_k) pour cette année.
-   """
-   col_pop = f"Pop {annee}"
-   col_dens = f"Densité {annee}"
-
-
-   etats = df["État"].tolist()
-   pop = df[col_pop].astype(float).tolist()
-   dens = df[col_dens].astype(float).tolist()
-
+   Version « par lot » de analyse_une_annee() :
+   toutes les colonnes 'Pop YYYY' et 'Densité YYYY' sont classées d'un coup
+   sous forme de matrices (États x années), puis Spearman et Kendall sont
+   calculés pour toutes les années en une seule passe vectorisée.
 
-   _, etats_pop = ordrePopulation(pop, etats)
-   _, etats_dens = ordrePopulation(dens, etats)
-
-
-   couples = classementPays(etats_pop, etats_dens)
-   rang_pop = [c[0] for c in couples]
-   rang_dens = [c[1] for c in couples]
+   Les États sans valeur pour une année sont écartés de cette année-là.
 
+   Retourne un DataFrame (annee, n, rs, p_s, tau, p_k).
+   """
+   annees = list(annees)
+   pop = df[[f"Pop {annee}" for annee in annees]].to_numpy(dtype=float)
+   dens = df[[f"Densité {annee}" for annee in annees]].to_numpy(dtype=float)
 
-   return analyse_rangs(rang_pop, rang_dens)
+   resultats = correlations_des_rangs(pop, dens, methode="ordinal")
+   return pd.DataFrame({"annee": annees, **resultats})
 
 
 
 
-def bonus_population_mondiale():
+def bonus_population_mondiale(par_lot=True):
    """
    1. Factorise l’analyse des rangs dans analyse_une_annee().
    2. Analyse la concordance des rangs pour toutes les années 2007–2025.
+
+   par_lot=True : toutes les années sont traitées ensemble (analyse_toutes_annees()).
+   par_lot=False : boucle année par année avec analyse_une_annee().
    """
    df = ouvrir_un_fichier_etats()
 
@@ -171,9 +164,15 @@ def bonus_population_mondiale():
    resultats = []
 
 
-   for annee in range(2007, 2025 + 1):
-       rs, p_s, tau, p_k = analyse_une_annee(df, annee)
-       resultats.append((annee, rs, p_s, tau, p_k))
+   if par_lot:
+       df_res = analyse_toutes_annees(df, range(2007, 2025 + 1))
+       resultats = list(df_res[["annee", "rs", "p_s", "tau", "p_k"]].itertuples(index=False, name=None))
+   else:
+       for annee in range(2007, 2025 + 1):
+           resultats.append((annee, *analyse_une_annee(df, annee)))
+
+
+   for annee, rs, p_s, tau, p_k in resultats:
        print(f"Année {annee} : Spearman r_s = {rs:.3f} (p={p_s:.3g}), "
              f"Kendall tau = {tau:.3f} (p={p_k:.3g})")
 
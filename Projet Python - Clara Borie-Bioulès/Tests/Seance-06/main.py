@@ -2,27 +2,33 @@
 
 
 import os
-import math
-import pandas as pd
+import sys
+import numpy as np
 import matplotlib.pyplot as plt
 from scipy.stats import spearmanr, kendalltau
 
+from rang_taille import ajuster_rang_taille, partition_decroissante, points_rang_taille, resume_log
+
 
 
 
 # --------------------------------------------------------------------
-# 2. Fonction locale ouvrirUnFichier()
+# 2. ouvrirUnFichier() : chargeur commun (../chargement.py)
 # --------------------------------------------------------------------
-def ouvrirUnFichier(chemin_fichier: str) -> pd.DataFrame:
-   """
-   Ouvre un fichier CSV et renvoie un DataFrame pandas.
-   Le paramètre est une chaîne de caractères (chemin + nom du fichier).
-   """
-   if not os.path.exists(chemin_fichier):
-       raise FileNotFoundError(f"Fichier introuvable : {chemin_fichier}")
-   # low_memory=False pour éviter le warning de typage mixte
-   df = pd.read_csv(chemin_fichier, low_memory=False)
-   return df
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from chargement import ouvrirUnFichier
+
+
+# Courbe rang-taille : les TETE_RANG_TAILLE plus grandes surfaces point par
+# point, le reste résumé en NB_CLASSES_QUEUE classes logarithmiques
+TETE_RANG_TAILLE = 10_000
+NB_CLASSES_QUEUE = 50
+
+# Ajustement de la loi rang-taille : par défaut sur la tête seulement (déjà
+# triée), sans intervalles de confiance ; True : sur toutes les surfaces
+# (tri complet) avec NB_REECHANTILLONS rééchantillons bootstrap
+AJUSTEMENT_COMPLET = False
+NB_REECHANTILLONS = 1000
 
 
 
@@ -30,9 +36,19 @@ def ouvrirUnFichier(chemin_fichier: str) -> pd.DataFrame:
 # --------------------------------------------------------------------
 # 4. Fonction locale ordreDecroissant()
 # --------------------------------------------------------------------
-def ordreDecroissant(liste):
-   """Retourne une nouvelle liste triée en ordre décroissant."""
-   return sorted(liste, reverse=True)
+def ordreDecroissant(liste, k=None, nb_classes=NB_CLASSES_QUEUE):
+   """
+   Retourne une nouvelle liste triée en ordre décroissant.
+
+   Si k est donné (très grandes listes), pas de tri complet : retourne
+   (tete, queue) avec tete les k plus grandes valeurs en ordre décroissant
+   (np.argpartition) et queue le résumé du reste en nb_classes classes
+   logarithmiques (voir rang_taille.resume_log).
+   """
+   if k is None:
+       return sorted(liste, reverse=True)
+   tete, reste = partition_decroissante(liste, k)
+   return tete, resume_log(reste, len(tete), nb_classes)
 
 
 
@@ -41,8 +57,9 @@ def ordreDecroissant(liste):
 # 6. Fonction locale conversionLog()
 # --------------------------------------------------------------------
 def conversionLog(liste):
-   """Retourne une nouvelle liste avec log10 des valeurs strictement positives."""
-   return [math.log10(x) for x in liste if x > 0]
+   """Retourne un tableau NumPy avec log10 des valeurs strictement positives."""
+   x = np.asarray(liste, dtype=float)
+   return np.log10(x[x > 0])
 
 
 
@@ -99,7 +116,7 @@ def main():
    # 3. Isoler la colonne « Surface (km²) » et ajouter les continents
    surface_col = "Surface (km²)"
    # Forcer le typage en float
-   surfaces = df[surface_col].astype(float).tolist()
+   surfaces = df[surface_col].to_numpy(dtype=float)
 
 
    # Surfaces continentales (sans unité, en km²)
@@ -109,15 +126,16 @@ def main():
        7768030.0,   # Antarctique
        7605049.0,   # Australie
    ]
-   surfaces.extend(surfaces_continents)
+   surfaces = np.concatenate((surfaces, surfaces_continents))
 
 
-   # 4. Ordonner la liste obtenue (ordre décroissant)
-   surfaces_ordonnee = ordreDecroissant(surfaces)
+   # 4. Ordonner la liste obtenue (ordre décroissant) : tête complète, queue
+   #    résumée par classes (tout est dans la tête si la liste est courte)
+   tete, queue = ordreDecroissant(surfaces, k=TETE_RANG_TAILLE)
 
 
    # 5. Visualiser la loi rang-taille (échelle linéaire)
-   rangs = list(range(1, len(surfaces_ordonnee) + 1))
+   rangs, surfaces_ordonnee = points_rang_taille(tete, queue)
 
 
    plt.figure(figsize=(6, 4))
@@ -135,8 +153,20 @@ def main():
    surfaces_log = conversionLog(surfaces_ordonnee)
 
 
+   # Ajustement de la loi rang-taille (rang_taille.py) : régression log-log,
+   # loi de puissance par maximum de vraisemblance (et intervalles bootstrap
+   # si AJUSTEMENT_COMPLET)
+   if AJUSTEMENT_COMPLET:
+       ajustement = ajuster_rang_taille(surfaces, nb_reechantillons=NB_REECHANTILLONS)
+   else:
+       ajustement = ajuster_rang_taille(tete, nb_reechantillons=0)
+
+
    plt.figure(figsize=(6, 4))
    plt.plot(rangs_log, surfaces_log, marker="o", linestyle="none", markersize=2)
+   plt.plot(rangs_log, ajustement["ordonnee"] + ajustement["pente"] * rangs_log, color="red",
+            label=f"pente = {ajustement['pente']:.3f}")
+   plt.legend()
    plt.xlabel("log10(Rang)")
    plt.ylabel("log10(Surface)")
    plt.title("Loi rang-taille (log-log)")
@@ -150,6 +180,18 @@ def main():
    print("  rang_taille_loglog.png")
 
 
+   ic_pente = ic_alpha = ""
+   if "ic_pente" in ajustement:
+       ic_pente = f" (IC 95 % : {ajustement['ic_pente'][0]:.3f} ; {ajustement['ic_pente'][1]:.3f})"
+       ic_alpha = f" (IC 95 % : {ajustement['ic_alpha'][0]:.3f} ; {ajustement['ic_alpha'][1]:.3f})"
+   print(f"\nAjustement de la loi rang-taille ({ajustement['n']} plus grandes surfaces) :")
+   print(f"  Régression log-log : pente = {ajustement['pente']:.3f}{ic_pente}, "
+         f"R² = {ajustement['r2']:.3f}")
+   print(f"  Loi de puissance : alpha = {ajustement['alpha']:.3f}{ic_alpha}, "
+         f"xmin = {ajustement['xmin']:.4g} km², {ajustement['n_queue']} îles dans la queue, "
+         f"KS = {ajustement['ks']:.3f}")
+
+
    # 7. Exemple de test sur les rangs (commentaire explicatif dans la fonction)
    test_spearman_kendall(rangs)
 
@@ -162,76 +204,19 @@ if __name__ == "__main__":
 
 
 import os
-import pandas as pd
+import sys
 from scipy.stats import spearmanr, kendalltau
 
-
-
-
-# --------------------------------------------------------------------
-# 9. Fonction locale ouvrirUnFichier()
-# --------------------------------------------------------------------
-def ouvrirUnFichier(chemin_fichier: str) -> pd.DataFrame:
-   """
-   Ouvre un fichier CSV et renvoie un DataFrame pandas.
-   Le paramètre est une chaîne de caractères (chemin + nom du fichier).
-   """
-   if not os.path.exists(chemin_fichier):
-       raise FileNotFoundError(f"Fichier introuvable : {chemin_fichier}")
-   df = pd.read_csv(chemin_fichier)
-   return df
-
-
-
-
-# --------------------------------------------------------------------
-# 11. Fonction locale ordrePopulation()
-# --------------------------------------------------------------------
-def ordrePopulation(liste_valeurs, liste_etats):
-   """
-   Ordonne de manière décroissante la liste 'liste_valeurs'
-   en conservant la correspondance avec 'liste_etats'.
-
-
-   Retourne :
-     - liste des valeurs ordonnées
-     - liste des États réordonnés
-   """
-   couples = list(zip(liste_valeurs, liste_etats))
-   couples_triees = sorted(couples, key=lambda x: x[0], reverse=True)
-   valeurs_ord = [v for v, e in couples_triees]
-   etats_ord = [e for v, e in couples_triees]
-   return valeurs_ord, etats_ord
+from rangs import classement_aligne, codes_categoriels
 
 
 
 
 # --------------------------------------------------------------------
-# 12. Fonction locale classementPays()
+# 9. ouvrirUnFichier() : chargeur commun (../chargement.py)
 # --------------------------------------------------------------------
-def classementPays(etats_pop, etats_densite):
-   """
-   Prépare la comparaison de deux classements :
-   - etats_pop : liste d'États classés selon la population (ordre décroissant)
-   - etats_densite : liste d'États classés selon la densité (ordre décroissant)
-
-
-   Retour :
-     - liste de tuples (rang_pop, rang_dens)
-       alignés sur les mêmes États, triés par rang_pop.
-   """
-   rang_pop = {etat: i + 1 for i, etat in enumerate(etats_pop)}
-   rang_dens = {etat: i + 1 for i, etat in enumerate(etats_densite)}
-
-
-   etats_communs = [e for e in etats_pop if e in rang_dens]
-
-
-   couples_rangs = [(rang_pop[e], rang_dens[e]) for e in etats_communs]
-   couples_rangs.sort(key=lambda x: x[0])
-
-
-   return couples_rangs
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from chargement import ouvrirUnFichier
 
 
 
@@ -261,32 +246,19 @@ def main():
            raise ValueError(f"Colonne manquante dans le CSV : {col}")
 
 
-   etats = df["État"].tolist()
-   pop_2007 = df["Pop 2007"].astype(float).tolist()
-   pop_2025 = df["Pop 2025"].astype(float).tolist()
-   dens_2007 = df["Densité 2007"].astype(float).tolist()
-   dens_2025 = df["Densité 2025"].astype(float).tolist()
-
-
-   # 11. Ordonner de manière décroissante les listes
-   pop2007_ord, etats_pop2007 = ordrePopulation(pop_2007, etats)
-   pop2025_ord, etats_pop2025 = ordrePopulation(pop_2025, etats)
-   dens2007_ord, etats_dens2007 = ordrePopulation(dens_2007, etats)
-   dens2025_ord, etats_dens2025 = ordrePopulation(dens_2025, etats)
-
-
-   # 12. Préparer la comparaison des classements (population vs densité)
-   couples_rangs_2007 = classementPays(etats_pop2007, etats_dens2007)
-   couples_rangs_2025 = classementPays(etats_pop2025, etats_dens2025)
-
-
-   # 13. Isoler les deux colonnes de rangs sous forme de listes
-   rang_pop_2007 = [c[0] for c in couples_rangs_2007]
-   rang_dens_2007 = [c[1] for c in couples_rangs_2007]
+   # États remplacés par des codes entiers (rangs.py), valeurs en tableaux NumPy
+   codes, _ = codes_categoriels(df["État"])
+   pop_2007 = df["Pop 2007"].to_numpy(dtype=float)
+   pop_2025 = df["Pop 2025"].to_numpy(dtype=float)
+   dens_2007 = df["Densité 2007"].to_numpy(dtype=float)
+   dens_2025 = df["Densité 2025"].to_numpy(dtype=float)
 
 
-   rang_pop_2025 = [c[0] for c in couples_rangs_2025]
-   rang_dens_2025 = [c[1] for c in couples_rangs_2025]
+   # 11. Ordonner de manière décroissante (rang 1 = plus grande valeur),
+   # 12. aligner les classements population et densité sur les mêmes États,
+   # 13. et isoler les deux colonnes de rangs (triées par rang de population)
+   _, rang_pop_2007, rang_dens_2007 = classement_aligne(codes, pop_2007, codes, dens_2007)
+   _, rang_pop_2025, rang_dens_2025 = classement_aligne(codes, pop_2025, codes, dens_2025)
 
 
    # 14. Corrélation des rangs (Spearman) et concordance (Kendall)
@@ -0,0 +1,281 @@
+# fichier : src/rang_taille.py
+
+
+import numpy as np
+import pandas as pd
+from scipy.special import gammaln
+
+
+
+
+# --------------------------------------------------------------------
+# Ajustement de la loi rang-taille (loi de Zipf / loi de puissance)
+# --------------------------------------------------------------------
+# Trois estimations, toutes sur des tableaux NumPy :
+#   - régression log10(taille) = ordonnee + pente * log10(rang) sur la liste
+#     triée en ordre décroissant (pente ~ -1 pour la loi de Zipf) ;
+#   - exposant alpha de la loi de puissance continue p(x) ~ x^(-alpha) pour
+#     x >= xmin, par maximum de vraisemblance, xmin choisi en minimisant la
+#     distance de Kolmogorov-Smirnov (méthode de Clauset, Shalizi et Newman) ;
+#   - intervalles de confiance bootstrap de la pente et de alpha.
+#
+# Bootstrap : un rééchantillon est résumé par le nombre de copies de chaque
+# valeur (comptes). Les valeurs étant triées, le rééchantillon trié est
+# implicite : la valeur i y occupe les rangs C[i-1]+1 .. C[i] (C : comptes
+# cumulés), et la somme des log(rang) de ce bloc vaut
+# gammaln(C[i] + 1) - gammaln(C[i-1] + 1). Pas de tri par rééchantillon :
+# chaque lot de rééchantillons est traité par quelques produits matriciels.
+#
+# Pour les très grandes listes, la courbe rang-taille peut être construite
+# sans tri complet : les k plus grandes valeurs par sélection partielle
+# (np.argpartition, O(n)) puis tri de ces k valeurs seulement ; le reste est
+# résumé par classes logarithmiques (effectif, rangs couverts, taille moyenne).
+
+
+
+
+def valeurs_decroissantes(valeurs):
+   """Tableau des valeurs strictement positives (NaN exclus), en ordre décroissant."""
+   x = np.asarray(valeurs, dtype=float)
+   x = x[x > 0]
+   return -np.sort(-x)
+
+
+
+
+def partition_decroissante(valeurs, k):
+   """
+   Sépare 'valeurs' en (tete, reste) : les k plus grandes valeurs en ordre
+   décroissant, et les autres sans ordre particulier (sélection partielle,
+   pas de tri complet). Comme valeurs_decroissantes, seules les valeurs
+   strictement positives (NaN exclus) sont gardées ; k <= 0 : tête vide.
+   """
+   x = np.asarray(valeurs, dtype=float)
+   x = x[x > 0]
+   if k <= 0:
+       return x[:0], x
+   if k >= len(x):
+       return -np.sort(-x), x[:0]
+   indices = np.argpartition(x, len(x) - k)  # les k plus grandes en fin de tableau
+   return -np.sort(-x[indices[-k:]]), x[indices[:-k]]
+
+
+
+
+def resume_log(reste, rang_depart=0, nb_classes=50):
+   """
+   Résumé du reste d'une liste (valeurs sous la tête) par nb_classes classes
+   de largeur constante en log10 ; les valeurs non positives sont ignorées.
+
+   - rang_depart : nombre de valeurs avant le reste (longueur de la tête)
+
+   Retourne un tableau, de la plus grande classe à la plus petite : borne_inf,
+   borne_sup, effectif, rang_debut, rang_fin (rangs couverts dans l'ordre
+   décroissant complet) et taille_geo (moyenne géométrique des valeurs).
+   """
+   x = np.asarray(reste, dtype=float)
+   log_x = np.log10(x[x > 0])
+   colonnes = ["borne_inf", "borne_sup", "effectif", "rang_debut", "rang_fin", "taille_geo"]
+   if len(log_x) == 0:
+       return pd.DataFrame(columns=colonnes)
+
+   bords = np.linspace(log_x.min(), log_x.max(), nb_classes + 1)
+   largeur = (bords[-1] - bords[0]) / nb_classes or 1.0
+   classe = np.minimum(((log_x - bords[0]) / largeur).astype(np.intp), nb_classes - 1)
+   effectifs = np.bincount(classe, minlength=nb_classes)[::-1]
+   sommes = np.bincount(classe, weights=log_x, minlength=nb_classes)[::-1]
+   rang_fin = rang_depart + np.cumsum(effectifs)
+
+   garder = effectifs > 0
+   with np.errstate(invalid="ignore", divide="ignore"):
+       taille_geo = 10 ** (sommes / effectifs)
+   return pd.DataFrame({
+       "borne_inf": 10 ** bords[:-1][::-1],
+       "borne_sup": 10 ** bords[1:][::-1],
+       "effectif": effectifs,
+       "rang_debut": rang_fin - effectifs + 1,
+       "rang_fin": rang_fin,
+       "taille_geo": taille_geo,
+   })[garder].reset_index(drop=True)
+
+
+
+
+def points_rang_taille(tete, resume):
+   """
+   Points (rangs, tailles) de la courbe rang-taille : chaque valeur de la
+   tête à son rang, puis un point par classe du résumé (rang moyen
+   géométrique des rangs couverts, taille moyenne géométrique).
+   """
+   tete = np.asarray(tete, dtype=float)
+   rangs_queue = np.sqrt(resume["rang_debut"].to_numpy(dtype=float) * resume["rang_fin"].to_numpy(dtype=float))
+   rangs = np.concatenate((np.arange(1, len(tete) + 1, dtype=float), rangs_queue))
+   return rangs, np.concatenate((tete, resume["taille_geo"].to_numpy(dtype=float)))
+
+
+
+
+def regression_log_log(valeurs_triees, rang_max=None):
+   """
+   Régression des moindres carrés de log10(taille) sur log10(rang).
+
+   - valeurs_triees : tailles strictement positives en ordre décroissant
+   - rang_max : si donné, seuls les rang_max premiers rangs sont utilisés
+
+   Retourne un dictionnaire : pente, ordonnee, r2, n.
+   """
+   y = np.log10(np.asarray(valeurs_triees, dtype=float)[:rang_max])
+   x = np.log10(np.arange(1, len(y) + 1))
+   xc, yc = x - x.mean(), y - y.mean()
+   sxx, sxy, syy = xc @ xc, xc @ yc, yc @ yc
+   pente = sxy / sxx
+   return {
+       "pente": float(pente),
+       "ordonnee": float(y.mean() - pente * x.mean()),
+       "r2": float(sxy ** 2 / (sxx * syy)) if syy > 0 else np.nan,
+       "n": len(y),
+   }
+
+
+
+
+def exposant_mv(valeurs, xmin):
+   """
+   Exposant alpha de la loi de puissance continue au-dessus de xmin
+   (maximum de vraisemblance) : alpha = 1 + n / somme(ln(x / xmin)).
+
+   Retourne (alpha, erreur_type, n_queue).
+   """
+   x = np.asarray(valeurs, dtype=float)
+   queue = x[x >= xmin]
+   n = len(queue)
+   alpha = 1.0 + n / np.log(queue / xmin).sum()
+   return float(alpha), float((alpha - 1.0) / np.sqrt(n)), n
+
+
+
+
+def choisir_xmin(valeurs, nb_candidats=200, n_queue_min=50):
+   """
+   Choisit xmin parmi au plus nb_candidats valeurs observées (réparties sur
+   une échelle logarithmique) en minimisant la distance de Kolmogorov-Smirnov
+   entre la queue x >= xmin et la loi de puissance ajustée ; la queue doit
+   compter au moins n_queue_min valeurs.
+
+   Retourne un dictionnaire : xmin, alpha, ks, n_queue.
+   """
+   x = np.sort(np.asarray(valeurs, dtype=float))
+   x = x[x > 0]
+   n = len(x)
+   if n < n_queue_min:
+       raise ValueError(f"Pas assez de valeurs positives pour ajuster une loi de puissance ({n} < {n_queue_min}).")
+
+   # Candidats : premières positions de valeurs distinctes, queue assez longue
+   debuts = np.flatnonzero(np.r_[True, x[1:] != x[:-1]])
+   debuts = debuts[n - debuts >= n_queue_min]
+   if len(debuts) > nb_candidats:
+       cibles = np.geomspace(x[debuts[0]], x[debuts[-1]], nb_candidats)
+       debuts = np.unique(debuts[np.minimum(np.searchsorted(x[debuts], cibles), len(debuts) - 1)])
+
+   # alpha de chaque candidat par les sommes cumulées (depuis la fin) de ln(x)
+   log_x = np.log(x)
+   somme_queue = np.cumsum(log_x[::-1])[::-1]
+   n_queue = n - debuts
+   xmins = x[debuts]
+   alphas = 1.0 + n_queue / (somme_queue[debuts] - n_queue * np.log(xmins))
+
+   distances = np.empty(len(debuts))
+   for j, (i, xmin, alpha) in enumerate(zip(debuts, xmins, alphas)):
+       queue = x[i:]
+       modele = 1.0 - (queue / xmin) ** (1.0 - alpha)
+       m = len(queue)
+       empirique_haut = np.arange(1, m + 1) / m
+       distances[j] = max(np.abs(empirique_haut - modele).max(), np.abs(empirique_haut - 1.0 / m - modele).max())
+
+   meilleur = int(np.argmin(distances))
+   return {"xmin": float(xmins[meilleur]), "alpha": float(alphas[meilleur]),
+           "ks": float(distances[meilleur]), "n_queue": int(n_queue[meilleur])}
+
+
+
+
+def bootstrap_rang_taille(valeurs_triees, xmin, nb_reechantillons=1000, niveau=0.95,
+                          graine=0, taille_lot=10_000_000):
+   """
+   Intervalles de confiance bootstrap (percentiles) de la pente log-log et de
+   l'exposant alpha (xmin fixé à celui de l'échantillon complet).
+
+   Les rééchantillons sont traités par lots de taille_lot valeurs au plus
+   (lot x n comptes en mémoire).
+
+   Retourne un dictionnaire : pentes et alphas (toutes les valeurs bootstrap),
+   ic_pente, ic_alpha (bornes inférieure et supérieure).
+   """
+   x = np.asarray(valeurs_triees, dtype=float)
+   n = len(x)
+   rng = np.random.default_rng(graine)
+
+   log_y = np.log10(x)
+   queue = (x >= xmin).astype(float)
+   log_queue = np.where(x >= xmin, np.log(x / xmin), 0.0)
+
+   # Sommes sur les rangs 1..n, identiques pour tous les rééchantillons
+   log_rangs = np.log10(np.arange(1, n + 1))
+   sx, sxx = log_rangs.sum(), log_rangs @ log_rangs
+
+   pentes, alphas = [], []
+   par_lot = max(1, taille_lot // n)
+   for debut in range(0, nb_reechantillons, par_lot):
+       b = min(par_lot, nb_reechantillons - debut)
+       tirages = rng.integers(0, n, size=(b, n))
+       comptes = np.bincount((tirages + n * np.arange(b)[:, None]).ravel(), minlength=b * n).reshape(b, n)
+
+       # Somme des log10(rang) occupés par chaque valeur dans le rééchantillon trié
+       cumul = np.cumsum(comptes, axis=1)
+       lg = gammaln(cumul + 1.0) / np.log(10)
+       log_rangs_bloc = np.diff(lg, axis=1, prepend=0.0)
+       sy = comptes @ log_y
+       sxy = (log_rangs_bloc * log_y).sum(axis=1)
+       pentes.append((n * sxy - sx * sy) / (n * sxx - sx ** 2))
+
+       n_queue = comptes @ queue
+       alphas.append(1.0 + n_queue / (comptes @ log_queue))
+
+   pentes, alphas = np.concatenate(pentes), np.concatenate(alphas)
+   bornes = [(1 - niveau) / 2, (1 + niveau) / 2]
+   return {
+       "pentes": pentes,
+       "alphas": alphas,
+       "ic_pente": tuple(float(q) for q in np.quantile(pentes, bornes)),
+       "ic_alpha": tuple(float(q) for q in np.quantile(alphas, bornes)),
+   }
+
+
+
+
+def ajuster_rang_taille(valeurs, xmin=None, nb_reechantillons=1000, niveau=0.95, graine=0,
+                        nb_candidats=200, n_queue_min=50):
+   """
+   Ajustement complet de la loi rang-taille sur 'valeurs' (liste ou tableau).
+
+   - xmin : seuil de la loi de puissance (None : choisi par choisir_xmin)
+   - nb_reechantillons : 0 pour ne pas calculer d'intervalles de confiance
+
+   Retourne un dictionnaire : pente, ordonnee, r2, n (régression log-log),
+   alpha, erreur_alpha, xmin, n_queue, ks (maximum de vraisemblance) et,
+   si nb_reechantillons > 0, ic_pente et ic_alpha au niveau 'niveau'.
+   """
+   x = valeurs_decroissantes(valeurs)
+   resultat = regression_log_log(x)
+
+   if xmin is None:
+       resultat.update(choisir_xmin(x, nb_candidats, n_queue_min))
+   else:
+       resultat.update({"xmin": float(xmin), "ks": np.nan})
+   alpha, erreur, n_queue = exposant_mv(x, resultat["xmin"])
+   resultat.update({"alpha": alpha, "erreur_alpha": erreur, "n_queue": n_queue})
+
+   if nb_reechantillons > 0:
+       bootstrap = bootstrap_rang_taille(x, resultat["xmin"], nb_reechantillons, niveau, graine)
+       resultat.update({"ic_pente": bootstrap["ic_pente"], "ic_alpha": bootstrap["ic_alpha"]})
+   return resultat
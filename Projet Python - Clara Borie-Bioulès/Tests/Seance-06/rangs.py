@@ -0,0 +1,209 @@
+# fichier : src/rangs.py
+
+
+import numpy as np
+import pandas as pd
+from scipy.stats import kendalltau, t as loi_student
+
+
+
+
+# --------------------------------------------------------------------
+# Outils internes : regroupement des ex aequo colonne par colonne
+# --------------------------------------------------------------------
+def _groupes_ex_aequo(cle):
+   """
+   Trie chaque colonne de 'cle' (tableau 2-D) et repère les groupes
+   de valeurs égales.
+
+   Retourne :
+     - ordre : indices de tri (argsort) de chaque colonne
+     - groupe : numéro du groupe (1, 2, ...) de chaque position triée
+     - effectifs : taille de chaque groupe, toutes colonnes confondues
+     - identifiants : indice de chaque position triée dans 'effectifs'
+     - nb_groupes : nombre de groupes par colonne
+   """
+   n, k = cle.shape
+   ordre = np.argsort(cle, axis=0, kind="stable")
+   tries = np.take_along_axis(cle, ordre, axis=0)
+
+   nouveau = np.ones((n, k), dtype=bool)
+   nouveau[1:] = tries[1:] != tries[:-1]
+   groupe = np.cumsum(nouveau, axis=0)
+
+   # Numérotation globale : les groupes de la colonne j suivent ceux de la colonne j-1
+   nb_groupes = nouveau.sum(axis=0)
+   decalage = np.concatenate(([0], np.cumsum(nb_groupes)[:-1]))
+   identifiants = groupe - 1 + decalage
+   effectifs = np.bincount(identifiants.ravel(), minlength=int(nb_groupes.sum()))
+   return ordre, groupe, effectifs, identifiants, nb_groupes
+
+
+
+
+# --------------------------------------------------------------------
+# Rangs de toutes les colonnes d'une matrice
+# --------------------------------------------------------------------
+def matrice_des_rangs(valeurs, methode="ordinal", decroissant=True):
+   """
+   Calcule les rangs de chaque colonne d'une matrice (entités x colonnes)
+   en une seule passe NumPy.
+
+   - methode : "ordinal" (rang de position dans l'ordre de tri),
+     "average", "min", "max" ou "dense" pour le traitement des ex aequo
+   - decroissant : True pour un classement « du plus grand au plus petit »
+
+   Les valeurs manquantes (NaN) reçoivent un rang NaN et ne décalent pas
+   les rangs des autres entités.
+   """
+   v = np.asarray(valeurs, dtype=float)
+   une_dimension = v.ndim == 1
+   if une_dimension:
+       v = v[:, None]
+   n, k = v.shape
+
+   manquant = np.isnan(v)
+   cle = -v if decroissant else v.copy()
+   cle[manquant] = np.inf  # les valeurs manquantes passent en fin de classement
+
+   if methode == "ordinal":
+       ordre = np.argsort(cle, axis=0, kind="stable")
+       rangs_tries = np.broadcast_to(np.arange(1, n + 1, dtype=float)[:, None], (n, k))
+   elif methode in ("average", "min", "max", "dense"):
+       ordre, groupe, effectifs, identifiants, nb_groupes = _groupes_ex_aequo(cle)
+       if methode == "dense":
+           rangs_tries = groupe.astype(float)
+       else:
+           # Position (1..n dans sa colonne) du dernier élément de chaque groupe
+           colonne_groupe = np.repeat(np.arange(k), nb_groupes)
+           fin = np.cumsum(effectifs) - n * colonne_groupe
+           rang_max = fin[identifiants].astype(float)
+           rang_min = rang_max - effectifs[identifiants] + 1
+           if methode == "max":
+               rangs_tries = rang_max
+           elif methode == "min":
+               rangs_tries = rang_min
+           else:
+               rangs_tries = (rang_min + rang_max) / 2.0
+   else:
+       raise ValueError(f"Méthode de rang inconnue : {methode}")
+
+   rangs = np.empty((n, k), dtype=float)
+   np.put_along_axis(rangs, ordre, rangs_tries, axis=0)
+   rangs[manquant] = np.nan
+
+   return rangs[:, 0] if une_dimension else rangs
+
+
+
+
+# --------------------------------------------------------------------
+# Classements alignés par codes (États, communes...)
+# --------------------------------------------------------------------
+def codes_categoriels(etats):
+   """
+   Remplace une liste de noms (États, communes...) par des codes entiers.
+
+   Retourne (codes, categories) : categories[codes[i]] est le nom de la ligne i.
+   """
+   codes, categories = pd.factorize(np.asarray(etats), sort=False)
+   return codes, np.asarray(categories)
+
+
+def rangs_par_code(codes, valeurs, nb_categories, methode="ordinal", decroissant=True):
+   """
+   Rang de chaque catégorie : le tableau renvoyé est indexé par le code
+   (NaN pour une catégorie absente ou sans valeur).
+   """
+   rangs = np.full(nb_categories, np.nan)
+   rangs[np.asarray(codes)] = matrice_des_rangs(valeurs, methode, decroissant)
+   return rangs
+
+
+def classement_aligne(codes_x, valeurs_x, codes_y, valeurs_y,
+                      nb_categories=None, methode="ordinal", decroissant=True):
+   """
+   Classe les entités selon x et selon y (chaque tableau peut contenir ses
+   propres entités, dans son propre ordre), puis aligne les deux rangs sur
+   les codes communs.
+
+   - methode : "ordinal", "average", "min", "max" ou "dense" (voir matrice_des_rangs)
+
+   Retourne (codes_communs, rang_x, rang_y), triés par rang_x croissant.
+   """
+   codes_x = np.asarray(codes_x)
+   codes_y = np.asarray(codes_y)
+   if nb_categories is None:
+       nb_categories = int(max(codes_x.max(initial=-1), codes_y.max(initial=-1))) + 1
+
+   rang_x = rangs_par_code(codes_x, valeurs_x, nb_categories, methode, decroissant)
+   rang_y = rangs_par_code(codes_y, valeurs_y, nb_categories, methode, decroissant)
+
+   communs = np.nonzero(~np.isnan(rang_x) & ~np.isnan(rang_y))[0]
+   communs = communs[np.argsort(rang_x[communs], kind="stable")]
+   return communs, rang_x[communs], rang_y[communs]
+
+
+
+
+# --------------------------------------------------------------------
+# Spearman et Kendall pour toutes les colonnes à la fois
+# --------------------------------------------------------------------
+def _kendall_par_colonne(rx, ry, valide):
+   """
+   Tau-b de Kendall et p-value (approximation normale avec correction
+   des ex aequo, comme scipy.stats.kendalltau en mode asymptotique)
+   pour chaque colonne de rx / ry.
+
+   Chaque colonne est traitée par scipy.stats.kendalltau (O(n log n),
+   compilé), sur ses entités valides seulement.
+   """
+   k = rx.shape[1]
+   tau = np.full(k, np.nan)
+   p = np.full(k, np.nan)
+   for j in range(k):
+       v = valide[:, j]
+       if v.sum() < 3:
+           continue
+       tau[j], p[j] = kendalltau(rx[v, j], ry[v, j], method="asymptotic")
+   return tau, p
+
+
+def correlations_des_rangs(x, y, methode="ordinal", decroissant=True):
+   """
+   Compare, colonne par colonne, le classement des entités selon x et selon y
+   (deux matrices entités x années de même forme).
+
+   Les rangs sont calculés en une passe sur toute la matrice, uniquement sur
+   les entités valides dans x ET y pour la colonne considérée.
+
+   Retourne un dictionnaire de tableaux (une case par colonne) :
+   n, rs, p_s, tau, p_k.
+   """
+   x = np.asarray(x, dtype=float)
+   y = np.asarray(y, dtype=float)
+   if x.shape != y.shape:
+       raise ValueError("Les deux matrices doivent avoir la même forme.")
+   if x.ndim == 1:
+       x, y = x[:, None], y[:, None]
+
+   valide = ~np.isnan(x) & ~np.isnan(y)
+   rx = matrice_des_rangs(np.where(valide, x, np.nan), methode, decroissant)
+   ry = matrice_des_rangs(np.where(valide, y, np.nan), methode, decroissant)
+
+   # Spearman = Pearson sur les rangs (sommes masquées)
+   nb = valide.sum(axis=0)
+   rx0 = np.where(valide, rx, 0.0)
+   ry0 = np.where(valide, ry, 0.0)
+   with np.errstate(divide="ignore", invalid="ignore"):
+       dx = np.where(valide, rx0 - rx0.sum(axis=0) / nb, 0.0)
+       dy = np.where(valide, ry0 - ry0.sum(axis=0) / nb, 0.0)
+       rs = (dx * dy).sum(axis=0) / np.sqrt((dx ** 2).sum(axis=0) * (dy ** 2).sum(axis=0))
+       rs = np.clip(rs, -1.0, 1.0)
+       ddl = nb - 2
+       t = rs * np.sqrt((ddl / ((rs + 1.0) * (1.0 - rs))).clip(0))
+   p_s = 2 * loi_student.sf(np.abs(t), ddl)
+
+   tau, p_k = _kendall_par_colonne(rx, ry, valide)
+
+   return {"n": nb, "rs": rs, "p_s": p_s, "tau": tau, "p_k": p_k}
@@ -0,0 +1,199 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from parallele import PREFIXES_ENERGIE, PREFIXES_PIB, colonnes_par_annee
+
+# Chargeur commun (../chargement.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from chargement import ouvrirUnFichier
+
+# ------------------------------------------------------------------
+# Lecture creuse du panel PIB / énergie
+# ------------------------------------------------------------------
+# Dans pib-vs-energie.csv, la plupart des cellules d'énergie sont vides ("").
+# Au lieu d'une matrice dense float64 sur laquelle on refait un dropna à
+# chaque année, on ne garde que les cellules renseignées :
+#   - chaque série (PIB, énergie) est stockée en CSR par territoire :
+#     indptr[i]:indptr[i+1] donne les années renseignées du territoire i ;
+#   - un index des cellules (territoire, année) où PIB ET énergie sont
+#     renseignés, rangé par année, permet d'aller directement aux lignes
+#     valides d'une année.
+
+
+class SerieCreuse:
+    """Une série (PIB ou énergie) au format CSR : territoires x années."""
+
+    def __init__(self, indptr, colonnes, valeurs):
+        self.indptr = indptr        # taille nb_territoires + 1
+        self.colonnes = colonnes    # indice de l'année de chaque valeur
+        self.valeurs = valeurs      # valeurs renseignées (float64)
+
+    def territoire(self, i):
+        """Retourne (indices des années, valeurs) du territoire i."""
+        debut, fin = self.indptr[i], self.indptr[i + 1]
+        return self.colonnes[debut:fin], self.valeurs[debut:fin]
+
+    @property
+    def nbytes(self):
+        return self.indptr.nbytes + self.colonnes.nbytes + self.valeurs.nbytes
+
+
+class PanelCreux:
+    """
+    Panel PIB / énergie creux, avec l'index des cellules valides par année.
+
+    Construction : PanelCreux.depuis_csv(chemin) (lecture par blocs)
+    ou PanelCreux.depuis_dataframe(df).
+    """
+
+    def __init__(self, noms, codes, annees, pib, energie, indptr_annee, lignes, pos_pib, pos_energie):
+        self.noms = noms
+        self.codes = codes
+        self.annees = annees
+        self.pib = pib
+        self.energie = energie
+        # Cellules valides rangées par année : indptr_annee[j]:indptr_annee[j+1]
+        self.indptr_annee = indptr_annee
+        self.lignes = lignes            # territoire de chaque cellule valide
+        self.pos_pib = pos_pib          # position de la cellule dans pib.valeurs
+        self.pos_energie = pos_energie  # position de la cellule dans energie.valeurs
+        self._colonne_annee = {int(a): j for j, a in enumerate(annees)}
+
+    # --------------------------------------------------------------
+    # Construction
+    # --------------------------------------------------------------
+    @classmethod
+    def depuis_blocs(cls, blocs):
+        """Construit le panel à partir d'un itérateur de DataFrame (blocs de lignes)."""
+        noms, codes = [], []
+        morceaux = {"pib": [], "energie": []}
+        comptes = {"pib": [], "energie": []}
+        valides = []
+        annees = None
+        nb_lignes = 0
+        total = {"pib": 0, "energie": 0}
+
+        for bloc in blocs:
+            bloc.columns = [str(c).strip() for c in bloc.columns]
+            if annees is None:
+                col_pib = colonnes_par_annee(bloc.columns, PREFIXES_PIB)
+                col_energie = colonnes_par_annee(bloc.columns, PREFIXES_ENERGIE)
+                annees = np.array(sorted(set(col_pib) & set(col_energie)), dtype=int)
+                colonnes = {"pib": [col_pib[a] for a in annees],
+                            "energie": [col_energie[a] for a in annees]}
+            noms.append(bloc.iloc[:, 0].to_numpy())
+            codes.append(bloc.iloc[:, 1].to_numpy())
+
+            masques = {}
+            for serie in ("pib", "energie"):
+                m = bloc[colonnes[serie]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+                masque = ~np.isnan(m)
+                masques[serie] = masque
+                _, col = np.nonzero(masque)  # ordre ligne puis année : déjà trié pour le CSR
+                morceaux[serie].append((col.astype(np.int16), m[masque]))
+                comptes[serie].append(masque.sum(axis=1))
+
+            # Cellules valides des deux séries et leur position dans chaque CSR
+            tous = masques["pib"] & masques["energie"]
+            ligne, col = np.nonzero(tous)
+            positions = {}
+            for serie in ("pib", "energie"):
+                rang = np.cumsum(masques[serie].ravel()) - 1
+                positions[serie] = total[serie] + rang[tous.ravel()]
+                total[serie] += int(masques[serie].sum())
+            valides.append((ligne + nb_lignes, col, positions["pib"], positions["energie"]))
+            nb_lignes += len(bloc)
+
+        if annees is None:  # aucun bloc (fichier vide) : panel vide
+            return cls.vide()
+
+        def csr(serie):
+            indptr = np.concatenate(([0], np.cumsum(np.concatenate(comptes[serie])))).astype(np.int32)
+            colonnes_csr = np.concatenate([c for c, _ in morceaux[serie]])
+            valeurs = np.concatenate([v for _, v in morceaux[serie]])
+            return SerieCreuse(indptr, colonnes_csr, valeurs)
+
+        lignes, cols, pos_pib, pos_energie = (np.concatenate(t) for t in zip(*valides))
+        ordre = np.lexsort((lignes, cols))  # par année puis par territoire
+        indptr_annee = np.concatenate(([0], np.cumsum(np.bincount(cols, minlength=len(annees)))))
+
+        return cls(
+            np.concatenate(noms), np.concatenate(codes), annees, csr("pib"), csr("energie"),
+            indptr_annee.astype(np.int32), lignes[ordre].astype(np.int32),
+            pos_pib[ordre].astype(np.int32), pos_energie[ordre].astype(np.int32),
+        )
+
+    @classmethod
+    def vide(cls):
+        """Panel sans territoire ni année."""
+        serie = SerieCreuse(np.zeros(1, dtype=np.int32), np.zeros(0, dtype=np.int16), np.zeros(0))
+        cellules = np.zeros(0, dtype=np.int32)
+        return cls(np.zeros(0, dtype=object), np.zeros(0, dtype=object), np.zeros(0, dtype=int),
+                   serie, serie, np.zeros(1, dtype=np.int32), cellules, cellules, cellules)
+
+    @classmethod
+    def depuis_csv(cls, chemin, taille_bloc=10_000):
+        """Lecture par blocs : la matrice dense du fichier n'est jamais construite en entier."""
+        return cls.depuis_blocs(ouvrirUnFichier(chemin, taille_bloc=taille_bloc))
+
+    @classmethod
+    def depuis_dataframe(cls, df):
+        return cls.depuis_blocs([df])
+
+    # --------------------------------------------------------------
+    # Accès aux cellules valides
+    # --------------------------------------------------------------
+    def annee(self, annee):
+        """
+        Retourne (lignes, pib, energie) pour les territoires où PIB et énergie
+        sont renseignés cette année-là, ou None si l'année est absente.
+        """
+        j = self._colonne_annee.get(int(annee))
+        if j is None:
+            return None
+        sl = slice(self.indptr_annee[j], self.indptr_annee[j + 1])
+        return (self.lignes[sl],
+                self.pib.valeurs[self.pos_pib[sl]],
+                self.energie.valeurs[self.pos_energie[sl]])
+
+    def donnees_annee(self, annee):
+        """Même tableau que traiter_annee() après son dropna, sans le parcourir."""
+        res = self.annee(annee)
+        if res is None:
+            return None
+        lignes, pib, energie = res
+        return pd.DataFrame({
+            "Nom_du_territoire": self.noms[lignes],
+            "Code_ISO_du_territoire": self.codes[lignes],
+            "PIB": pib,
+            "Energie": energie,
+        })
+
+    def nb_valides_par_annee(self):
+        return pd.Series(np.diff(self.indptr_annee), index=self.annees, name="nb_territoires")
+
+    def plages(self, serie="energie"):
+        """
+        Couverture d'une série en plages d'années consécutives renseignées
+        (codage par plages) : une ligne par (territoire, debut, fin).
+        """
+        s = self.pib if serie == "pib" else self.energie
+        lignes = np.repeat(np.arange(len(self.noms)), np.diff(s.indptr))
+        cols = s.colonnes.astype(np.int64)
+        nouvelle = np.ones(len(cols), dtype=bool)
+        nouvelle[1:] = (lignes[1:] != lignes[:-1]) | (cols[1:] != cols[:-1] + 1)
+        debut = np.nonzero(nouvelle)[0]
+        fin = np.r_[debut[1:], len(cols)][:len(debut)] - 1  # [:len(debut)] : panel vide
+        return pd.DataFrame({
+            "Nom_du_territoire": self.noms[lignes[debut]],
+            "debut": self.annees[cols[debut]],
+            "fin": self.annees[cols[fin]],
+        })
+
+    @property
+    def nbytes(self):
+        return (self.pib.nbytes + self.energie.nbytes + self.indptr_annee.nbytes
+                + self.lignes.nbytes + self.pos_pib.nbytes + self.pos_energie.nbytes)
@@ -1,8 +1,18 @@
+import sys
+from contextlib import nullcontext
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from scipy import stats
 
+# Chargeur commun (../chargement.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from chargement import ouvrirUnFichier
+from couverture import PanelCreux
+from parallele import traiter_annees_en_parallele
+from sorties import EcrivainDetails
+from statistiques_panel import details_par_annee, matrices_par_annee, resume_par_annee
+
 # ------------------------------------------------------------------
 # Paramètres généraux
 # ------------------------------------------------------------------
@@ -10,36 +20,49 @@ DATA_PATH = Path("./data/pib-vs-energie.csv")
 ANNEE_DEBUT = 1962
 ANNEE_FIN = 2022
 
+# "sequentiel" (boucle sur traiter_annee), "processus", "threads"
+# ou "lot" (toutes les années en une passe, voir statistiques_panel.py)
+MODE_EXECUTION = "sequentiel"
+
 # Dossier où ranger les fichiers de sortie
 OUTPUT_DIR = Path("sorties_par_annee")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-# ------------------------------------------------------------------
-# Chargement des données
-# ------------------------------------------------------------------
-df = pd.read_csv(DATA_PATH)
-df.columns = [c.strip() for c in df.columns]
+# Détail par année : "fichiers" (un CSV par année) ou un seul fichier
+# découpé par année, "parquet" ou "csv" (voir sorties.py)
+SORTIE_DETAILS = "fichiers"
 
-print("Colonnes :", df.columns.tolist())
+# True : en mode séquentiel, le fichier est lu par blocs dans un panel creux
+# (couverture.py) sans construire le tableau dense, et traiter_annee() lit
+# directement les territoires valides de chaque année, sans dropna.
+# False : tableau dense chargé en entier (toujours le cas des autres modes)
+LECTURE_CREUSE = True
 
 # ------------------------------------------------------------------
 # Fonction de traitement pour une année donnée
 # ------------------------------------------------------------------
-def traiter_annee(df: pd.DataFrame, annee: int) -> dict:
+def traiter_annee(df, annee: int, ecrivain=None, panel=None) -> dict:
     col_pib = f"PIB_{annee}"
     col_energie = f"Utilisation_d_energie_{annee}"
 
-    # Vérifier que les colonnes existent
-    if col_pib not in df.columns or col_energie not in df.columns:
-        print(f"Année {annee} : colonnes manquantes, ignorée.")
-        return None
-
-    # Extraire les deux colonnes + identifiants
-    data = df[["Nom_du_territoire", "Code_ISO_du_territoire", col_pib, col_energie]].copy()
-    data = data.rename(columns={col_pib: "PIB", col_energie: "Energie"})
-
-    # Nettoyage
-    data = data.dropna(subset=["PIB", "Energie"])
+    if panel is not None:
+        # Lignes valides de l'année lues dans l'index du panel creux
+        data = panel.donnees_annee(annee)
+        if data is None:
+            print(f"Année {annee} : colonnes manquantes, ignorée.")
+            return None
+    else:
+        # Vérifier que les colonnes existent
+        if col_pib not in df.columns or col_energie not in df.columns:
+            print(f"Année {annee} : colonnes manquantes, ignorée.")
+            return None
+
+        # Extraire les deux colonnes + identifiants
+        data = df[["Nom_du_territoire", "Code_ISO_du_territoire", col_pib, col_energie]].copy()
+        data = data.rename(columns={col_pib: "PIB", col_energie: "Energie"})
+
+        # Nettoyage
+        data = data.dropna(subset=["PIB", "Energie"])
 
     if data.empty:
         print(f"Année {annee} : aucune donnée valide, ignorée.")
@@ -60,8 +83,11 @@ def traiter_annee(df: pd.DataFrame, annee: int) -> dict:
     intercept = y_mean - slope * x_mean
 
     # Sauvegarde des données détaillées de l’année
-    out_year_path = OUTPUT_DIR / f"pib_energie_{annee}.csv"
-    data.to_csv(out_year_path, index=False)
+    if ecrivain is not None:
+        ecrivain.ajouter(annee, data)
+    else:
+        out_year_path = OUTPUT_DIR / f"pib_energie_{annee}.csv"
+        data.to_csv(out_year_path, index=False)
 
     # Retourner un résumé pour cette année
     return {
@@ -76,19 +102,62 @@ def traiter_annee(df: pd.DataFrame, annee: int) -> dict:
     }
 
 # ------------------------------------------------------------------
-# Boucle sur toutes les années + fichier récapitulatif
+# Chargement des données + boucle sur toutes les années
 # ------------------------------------------------------------------
-resultats = []
-
-for annee in range(ANNEE_DEBUT, ANNEE_FIN + 1):
-    res = traiter_annee(df, annee)
-    if res is not None:
-        resultats.append(res)
-
-# Créer un CSV de synthèse pour toutes les années
-df_resume = pd.DataFrame(resultats)
-df_resume.to_csv("resume_par_annee.csv", index=False)
-
-print("\nFichiers créés :")
-print(" - Détail par année dans le dossier 'sorties_par_annee/'")
-print(" - Synthèse globale : resume_par_annee.csv")
+# Sous if __name__ : les processus du mode "processus" (spawn, Windows / macOS)
+# réimportent ce script sans relancer le traitement
+if __name__ == "__main__":
+    # Chargement des données
+    if MODE_EXECUTION == "sequentiel" and LECTURE_CREUSE:
+        # Panel creux : seules les cellules renseignées, lues par blocs
+        df = None
+        panel_creux = PanelCreux.depuis_csv(DATA_PATH)
+        print(f"Panel creux : {len(panel_creux.noms)} territoires x {len(panel_creux.annees)} années, "
+              f"{panel_creux.nbytes} octets")
+    else:
+        # Relu depuis le cache binaire (data/.cache) après le premier passage
+        df = ouvrirUnFichier(DATA_PATH, cache=True)
+        df.columns = [c.strip() for c in df.columns]
+        panel_creux = None
+
+        print("Colonnes :", df.columns.tolist())
+
+    # Boucle sur toutes les années + fichier récapitulatif
+    resultats = []
+
+    # Un seul fichier pour tout le détail, ou None pour un CSV par année.
+    # Le with ferme le fichier même si une année lève une exception.
+    if SORTIE_DETAILS == "fichiers":
+        sortie = nullcontext()
+    else:
+        sortie = EcrivainDetails(OUTPUT_DIR / f"pib_energie.{SORTIE_DETAILS}", SORTIE_DETAILS)
+
+    with sortie as ecrivain:
+        if MODE_EXECUTION == "sequentiel":
+            for annee in range(ANNEE_DEBUT, ANNEE_FIN + 1):
+                res = traiter_annee(df, annee, ecrivain, panel_creux)
+                if res is not None:
+                    resultats.append(res)
+        elif MODE_EXECUTION == "lot":
+            # Matrices territoires x années construites une fois pour le résumé et le détail
+            annees = range(ANNEE_DEBUT, ANNEE_FIN + 1)
+            matrices = matrices_par_annee(df, annees)
+            resultats = resume_par_annee(df, annees, matrices).to_dict("records")
+            for annee, data in details_par_annee(df, annees, matrices):
+                if ecrivain is not None:
+                    ecrivain.ajouter(annee, data)
+                else:
+                    data.to_csv(OUTPUT_DIR / f"pib_energie_{annee}.csv", index=False)
+        else:
+            # Années réparties entre plusieurs processus / threads (voir parallele.py)
+            resultats = traiter_annees_en_parallele(
+                df, range(ANNEE_DEBUT, ANNEE_FIN + 1), OUTPUT_DIR, mode=MODE_EXECUTION, ecrivain=ecrivain
+            )
+
+    # Créer un CSV de synthèse pour toutes les années
+    df_resume = pd.DataFrame(resultats)
+    df_resume.to_csv("resume_par_annee.csv", index=False)
+
+    print("\nFichiers créés :")
+    print(" - Détail par année dans le dossier 'sorties_par_annee/'")
+    print(" - Synthèse globale : resume_par_annee.csv")
@@ -1,3 +1,4 @@
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -5,6 +6,11 @@ from scipy import stats
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Chargeur commun (../chargement.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from chargement import ouvrirUnFichier
+from panel import colonnes_identifiants, panel_long, statistiques_par_territoire
+
 # ------------------------------------------------------------------
 # Paramètres généraux
 # ------------------------------------------------------------------
@@ -17,7 +23,8 @@ ANNEE_FIN = 2020
 # Étape 1 – Chargement et nettoyage de base
 # ------------------------------------------------------------------
 def charger_donnees(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    # Relu depuis le cache binaire (data/.cache) après le premier passage
+    df = ouvrirUnFichier(path, cache=True)
     # Standardisation minimale des noms de colonnes
     df.columns = [c.strip() for c in df.columns]
     return df
@@ -32,43 +39,15 @@ print(df.columns.tolist())
 # ------------------------------------------------------------------
 # Étape 2 – Mise en forme pour une analyse bivariée (PIB vs énergie)
 # ------------------------------------------------------------------
-# Hypothèse : colonnes de type 'PIBYYYY' et 'UtilisationdenergieYYYY'
-colonnes_pib = [c for c in df.columns if c.startswith("PIB")]
-colonnes_energie = [c for c in df.columns if c.startswith("Utilisationdenergie")]
+# Colonnes de type 'PIB_YYYY' / 'Utilisation_d_energie_YYYY' (ou 'PIBYYYY' /
+# 'UtilisationdenergieYYYY') : l'année est lue une fois dans le nom de colonne
+# et le panel long de tous les territoires est construit d'un coup (panel.py),
+# sans melt ni merge. Les lignes manquantes sont déjà supprimées.
+panel = panel_long(df, ANNEE_DEBUT, ANNEE_FIN)
+col_territoire, col_code = colonnes_identifiants(df)
 
 # Extraire le territoire étudié
-df_territoire = df[df["Nomduterritoire"] == TERRITOIRE_CIBLE].copy()
-
-# Mise au format long
-pib_long = df_territoire.melt(
-    id_vars=["Nomduterritoire", "CodeISOduterritoire"],
-    value_vars=colonnes_pib,
-    var_name="Annee",
-    value_name="PIB"
-)
-pib_long["Annee"] = pib_long["Annee"].str.replace("PIB", "").astype(int)
-
-energie_long = df_territoire.melt(
-    id_vars=["Nomduterritoire", "CodeISOduterritoire"],
-    value_vars=colonnes_energie,
-    var_name="Annee",
-    value_name="Energie"
-)
-energie_long["Annee"] = energie_long["Annee"].str.replace("Utilisationdenergie", "").astype(int)
-
-# Fusion PIB + énergie
-df_long = pd.merge(
-    pib_long[["Nomduterritoire", "CodeISOduterritoire", "Annee", "PIB"]],
-    energie_long[["Annee", "Energie"]],
-    on="Annee",
-    how="inner"
-)
-
-# Filtrer sur une période
-df_long = df_long[(df_long["Annee"] >= ANNEE_DEBUT) & (df_long["Annee"] <= ANNEE_FIN)].copy()
-
-# Suppression des lignes manquantes
-df_long = df_long.dropna(subset=["PIB", "Energie"])
+df_long = panel.xs(TERRITOIRE_CIBLE, level=col_territoire, drop_level=False).reset_index()
 
 print("\nAperçu des données longues :")
 print(df_long.head())
@@ -148,6 +127,19 @@ resume = {
 df_resume = pd.DataFrame(resume)
 df_resume.to_csv("resume_stats_pib_energie.csv", index=False)
 
+# ------------------------------------------------------------------
+# Étape 7 – Même analyse pour tous les territoires (une seule passe)
+# ------------------------------------------------------------------
+panel.to_csv("resultats_pib_energie_long_tous_territoires.csv")
+
+df_territoires = statistiques_par_territoire(df, ANNEE_DEBUT, ANNEE_FIN)
+df_territoires.to_csv("resume_stats_par_territoire.csv", index=False)
+
+print("\nRégression PIB–Energie par territoire (aperçu) :")
+print(df_territoires[[col_territoire, "nb_annees", "correlation_pearson", "R2", "pente_regression"]].head())
+
 print("\nFichiers exportés :")
 print(" - resultats_pib_energie_long.csv")
 print(" - resume_stats_pib_energie.csv")
+print(" - resultats_pib_energie_long_tous_territoires.csv")
+print(" - resume_stats_par_territoire.csv")
@@ -0,0 +1,107 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from parallele import PREFIXES_ENERGIE, PREFIXES_PIB, colonnes_par_annee
+from statistiques_panel import matrices_par_annee, statistiques_colonnes
+
+# ------------------------------------------------------------------
+# Panel long PIB / énergie pour tous les territoires à la fois
+# ------------------------------------------------------------------
+# Les colonnes 'PIB_YYYY' / 'Utilisation_d_energie_YYYY' (ou sans les
+# « _ » : 'PIBYYYY', 'UtilisationdenergieYYYY') sont lues une seule fois
+# (matrices construites par parallele.matrice_pib_energie, comme pour les
+# modes "lot", "processus" et "threads"), puis les deux matrices
+# territoires x années sont mises bout à bout (ravel) au lieu de deux
+# melt et d'un merge.
+
+
+def colonnes_identifiants(df: pd.DataFrame) -> tuple:
+    """Noms des colonnes nom / code ISO du territoire (deux premières colonnes du fichier)."""
+    return df.columns[0], df.columns[1]
+
+
+def matrices_panel(df: pd.DataFrame, annee_debut=None, annee_fin=None) -> tuple:
+    """
+    Retourne (annees, PIB, Energie) : années communes aux deux séries
+    (bornées par annee_debut / annee_fin) et matrices territoires x années
+    (NaN pour les cellules vides ou non numériques).
+    """
+    annees = sorted(set(colonnes_par_annee(df.columns, PREFIXES_PIB))
+                    & set(colonnes_par_annee(df.columns, PREFIXES_ENERGIE)))
+    if annee_debut is not None:
+        annees = [a for a in annees if a >= annee_debut]
+    if annee_fin is not None:
+        annees = [a for a in annees if a <= annee_fin]
+    return matrices_par_annee(df, annees)
+
+
+def panel_long(df: pd.DataFrame, annee_debut=None, annee_fin=None, dropna=True) -> pd.DataFrame:
+    """
+    Panel long (une ligne par territoire et par année), indexé par
+    (territoire, Annee), avec les colonnes code ISO, PIB et Energie.
+
+    dropna=True garde seulement les couples (territoire, année) où PIB et
+    énergie sont renseignés, comme le dropna du script principal.
+    """
+    col_nom, col_code = colonnes_identifiants(df)
+    annees, pib, energie = matrices_panel(df, annee_debut, annee_fin)
+    n, k = pib.shape
+
+    # Territoire i, année j -> ligne i * k + j (ordre territoire puis année)
+    ligne_territoire = np.repeat(np.arange(n), k)
+    pib_long = pib.ravel()
+    energie_long = energie.ravel()
+    garder = slice(None)
+    if dropna:
+        garder = ~np.isnan(pib_long) & ~np.isnan(energie_long)
+
+    index = pd.MultiIndex.from_arrays(
+        [df[col_nom].to_numpy()[ligne_territoire[garder]], np.tile(annees, n)[garder]],
+        names=[col_nom, "Annee"],
+    )
+    return pd.DataFrame({
+        col_code: df[col_code].to_numpy()[ligne_territoire[garder]],
+        "PIB": pib_long[garder],
+        "Energie": energie_long[garder],
+    }, index=index)
+
+
+def statistiques_par_territoire(df: pd.DataFrame, annee_debut=None, annee_fin=None) -> pd.DataFrame:
+    """
+    Statistiques descriptives (n, moyenne, écart type, min, max de PIB et
+    d'énergie) et régression Energie = a + b * PIB de chaque territoire,
+    calculées en une passe sur les matrices années x territoires.
+
+    Seules les années où PIB et énergie sont tous deux renseignés comptent.
+    """
+    col_nom, col_code = colonnes_identifiants(df)
+    _, pib, energie = matrices_panel(df, annee_debut, annee_fin)
+
+    # Une colonne par territoire : mêmes réductions que pour les années
+    x, y = pib.T, energie.T
+    valide = ~np.isnan(x) & ~np.isnan(y)
+    x = np.where(valide, x, np.nan)
+    y = np.where(valide, y, np.nan)
+
+    resultats = {col_nom: df[col_nom].to_numpy(), col_code: df[col_code].to_numpy()}
+    with warnings.catch_warnings():
+        # Territoires sans aucune année valide : NaN, sans avertissement
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for nom, m in (("PIB", x), ("Energie", y)):
+            resultats[f"moyenne_{nom}"] = np.nanmean(m, axis=0)
+            resultats[f"ecart_type_{nom}"] = np.nanstd(m, axis=0, ddof=1)
+            resultats[f"min_{nom}"] = np.nanmin(m, axis=0)
+            resultats[f"max_{nom}"] = np.nanmax(m, axis=0)
+
+    reg = statistiques_colonnes(x, y)
+    resultats = {
+        col_nom: resultats.pop(col_nom),
+        col_code: resultats.pop(col_code),
+        "nb_annees": reg.pop("n"),
+        **resultats,
+        "covariance_pib_energie": reg.pop("covariance"),
+        **reg,
+    }
+    return pd.DataFrame(resultats)
@@ -0,0 +1,195 @@
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Pool de processus commun (../processus.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from processus import executer_en_parallele
+
+# ------------------------------------------------------------------
+# Traitement des années en parallèle (version parallèle de traiter_annee)
+# ------------------------------------------------------------------
+# La matrice PIB/énergie (territoires x colonnes) est copiée une seule fois
+# dans un bloc de mémoire partagée : chaque processus y accède par une vue
+# NumPy, sans recevoir de copie picklée du DataFrame.
+
+MODES = ("processus", "threads")
+
+# Colonnes 'PIB_YYYY' / 'Utilisation_d_energie_YYYY', ou sans les « _ »
+PREFIXES_PIB = ("PIB",)
+PREFIXES_ENERGIE = ("Utilisation_d_energie", "Utilisationdenergie")
+
+# État de chaque processus de travail (rempli par _initialiser)
+_ETAT = {}
+
+
+def colonnes_par_annee(colonnes, prefixes) -> dict:
+    """
+    Retourne {annee: nom_de_colonne} pour le premier préfixe présent
+    (colonnes de la forme <prefixe>YYYY ou <prefixe>_YYYY).
+    """
+    for prefixe in prefixes:
+        motif = re.compile(rf"^{re.escape(prefixe)}_?(\d{{4}})$")
+        trouvees = {int(m.group(1)): c for c in colonnes if (m := motif.match(c))}
+        if trouvees:
+            return trouvees
+    return {}
+
+
+def matrice_pib_energie(df: pd.DataFrame, annees) -> tuple:
+    """
+    Construit la matrice float64 (territoires x 2 colonnes par année) :
+    colonnes [PIB_a, Energie_a] pour chaque année disponible.
+
+    Les cellules non numériques sont converties en NaN.
+    Retourne (matrice, {annee: (indice_pib, indice_energie)}, annees_manquantes).
+    """
+    col_pib = colonnes_par_annee(df.columns, PREFIXES_PIB)
+    col_energie = colonnes_par_annee(df.columns, PREFIXES_ENERGIE)
+    colonnes = []
+    indices = {}
+    manquantes = []
+    for annee in annees:
+        if annee not in col_pib or annee not in col_energie:
+            manquantes.append(annee)
+            continue
+        indices[annee] = (len(colonnes), len(colonnes) + 1)
+        colonnes += [col_pib[annee], col_energie[annee]]
+
+    matrice = np.empty((len(df), len(colonnes)), dtype=np.float64)
+    for j, col in enumerate(colonnes):
+        matrice[:, j] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+    return matrice, indices, manquantes
+
+
+def _initialiser(nom_memoire, forme, noms, codes, dossier_sortie, matrice=None):
+    """Rattache le processus (ou le thread) à la matrice partagée."""
+    if matrice is None:
+        memoire = SharedMemory(name=nom_memoire)
+        _ETAT["memoire"] = memoire  # garder une référence tant que la vue existe
+        matrice = np.ndarray(forme, dtype=np.float64, buffer=memoire.buf)
+    _ETAT["matrice"] = matrice
+    _ETAT["noms"] = noms
+    _ETAT["codes"] = codes
+    _ETAT["dossier_sortie"] = dossier_sortie
+
+
+def statistiques_pib_energie(x: np.ndarray, y: np.ndarray, annee: int) -> dict:
+    """Mêmes statistiques que traiter_annee() pour deux vecteurs déjà nettoyés."""
+    cov_xy = np.cov(x, y, ddof=1)[0, 1]
+    corr, p_val = stats.pearsonr(x, y)
+
+    # Régression linéaire « à la main »
+    x_mean, y_mean = x.mean(), y.mean()
+    Sxx = np.sum((x - x_mean)**2)
+    Sxy = np.sum((x - x_mean)*(y - y_mean))
+    slope = Sxy / Sxx
+    intercept = y_mean - slope * x_mean
+
+    return {
+        "annee": annee,
+        "nb_territoires": len(x),
+        "covariance_pib_energie": cov_xy,
+        "correlation_pearson": corr,
+        "p_value_correlation": p_val,
+        "R2": corr**2,
+        "pente_regression": slope,
+        "intercept_regression": intercept,
+    }
+
+
+def _traiter(tache):
+    annee, (i_pib, i_energie) = tache
+    matrice = _ETAT["matrice"]
+    pib = matrice[:, i_pib]
+    energie = matrice[:, i_energie]
+
+    valide = ~np.isnan(pib) & ~np.isnan(energie)
+    if not valide.any():
+        return annee, None, None
+
+    data = pd.DataFrame({
+        "Nom_du_territoire": _ETAT["noms"][valide],
+        "Code_ISO_du_territoire": _ETAT["codes"][valide],
+        "PIB": pib[valide],
+        "Energie": energie[valide],
+    })
+    resume = statistiques_pib_energie(data["PIB"].to_numpy(), data["Energie"].to_numpy(), annee)
+
+    # Sans dossier de sortie, le détail est renvoyé au processus principal
+    # (écriture groupée par un EcrivainDetails)
+    if _ETAT["dossier_sortie"] is None:
+        return annee, resume, data
+    data.to_csv(Path(_ETAT["dossier_sortie"]) / f"pib_energie_{annee}.csv", index=False)
+    return annee, resume, None
+
+
+def traiter_annees_en_parallele(df: pd.DataFrame, annees, dossier_sortie: Path,
+                                mode: str = "processus", nb_travailleurs: int = None,
+                                ecrivain=None) -> list:
+    """
+    Équivalent parallèle de la boucle sur traiter_annee() :
+    répartit les années entre plusieurs processus (ou threads), écrit le
+    fichier détaillé de chaque année et renvoie la liste des résumés.
+
+    Avec un 'ecrivain' (sorties.EcrivainDetails), le détail de chaque année
+    est ajouté au fichier unique par le processus principal, dans l'ordre
+    des années, au lieu d'un fichier par année.
+
+    Le résultat ne dépend pas de l'ordonnancement : les résumés sont
+    renvoyés dans l'ordre des années et les messages sont affichés
+    après coup, dans ce même ordre.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode inconnu : {mode} (attendu : {', '.join(MODES)})")
+    nb_travailleurs = nb_travailleurs or os.cpu_count() or 1
+
+    annees = list(annees)
+    matrice, indices, manquantes = matrice_pib_energie(df, annees)
+    noms = df["Nom_du_territoire"].to_numpy(dtype=object)
+    codes = df["Code_ISO_du_territoire"].to_numpy(dtype=object)
+    taches = [(annee, indices[annee]) for annee in annees if annee in indices]
+    dossier = None if ecrivain is not None else str(dossier_sortie)
+
+    if mode == "threads":
+        # Les threads partagent déjà la mémoire du processus principal
+        _initialiser(None, matrice.shape, noms, codes, dossier, matrice)
+        with ThreadPoolExecutor(max_workers=nb_travailleurs) as executeur:
+            sorties = list(executeur.map(_traiter, taches))
+    else:
+        memoire = SharedMemory(create=True, size=max(1, matrice.nbytes))
+        try:
+            partagee = np.ndarray(matrice.shape, dtype=np.float64, buffer=memoire.buf)
+            partagee[:] = matrice
+            del partagee
+            sorties = executer_en_parallele(
+                _traiter, taches, nb_travailleurs,
+                chunksize=max(1, len(taches) // (4 * nb_travailleurs)),
+                initializer=_initialiser,
+                initargs=(memoire.name, matrice.shape, noms, codes, dossier),
+            )
+        finally:
+            memoire.close()
+            memoire.unlink()
+
+    resultats_par_annee = {annee: (resume, data) for annee, resume, data in sorties}
+    resultats = []
+    for annee in annees:
+        if annee in manquantes:
+            print(f"Année {annee} : colonnes manquantes, ignorée.")
+            continue
+        resume, data = resultats_par_annee[annee]
+        if resume is None:
+            print(f"Année {annee} : aucune donnée valide, ignorée.")
+            continue
+        if ecrivain is not None:
+            ecrivain.ajouter(annee, data)
+        resultats.append(resume)
+    return resultats
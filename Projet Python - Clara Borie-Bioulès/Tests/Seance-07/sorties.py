@@ -0,0 +1,120 @@
+import json
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow absent : seul le format csv est disponible
+    pa = pq = None
+
+# ------------------------------------------------------------------
+# Écriture groupée du détail par année (un seul fichier)
+# ------------------------------------------------------------------
+# Au lieu d'un fichier pib_energie_{annee}.csv par année, toutes les années
+# vont dans un seul fichier, découpé en un bloc par année :
+#   - parquet : un « row group » par année, relu sélectivement ;
+#   - csv : un seul CSV avec une colonne 'annee', plus un index
+#     (<fichier>.index.json) des positions de début/fin de chaque année.
+
+FORMATS = ("parquet", "csv")
+
+
+def _chemin_index(chemin: Path) -> Path:
+    return chemin.with_name(chemin.name + ".index.json")
+
+
+class EcrivainDetails:
+    """
+    Ajoute le détail de chaque année à un fichier unique.
+
+        with EcrivainDetails("sorties_par_annee/pib_energie.parquet") as ecrivain:
+            ecrivain.ajouter(annee, data)
+    """
+
+    def __init__(self, chemin, fmt: str = None):
+        self.chemin = Path(chemin)
+        self.fmt = fmt or ("parquet" if pq is not None else "csv")
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Format inconnu : {self.fmt} (attendu : {', '.join(FORMATS)})")
+        if self.fmt == "parquet" and pq is None:
+            raise ImportError("Le format parquet nécessite pyarrow.")
+
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        self._ecrivain = None
+        self._fichier = None
+        self._index = {}
+
+    def ajouter(self, annee: int, data: pd.DataFrame) -> None:
+        """Écrit les lignes d'une année dans un bloc à part."""
+        if str(annee) in self._index:
+            raise ValueError(f"Année {annee} déjà écrite dans {self.chemin}.")
+        bloc = data.assign(annee=int(annee))
+
+        if self.fmt == "parquet":
+            table = pa.Table.from_pandas(bloc, preserve_index=False)
+            if self._ecrivain is None:
+                self._ecrivain = pq.ParquetWriter(self.chemin, table.schema)
+            else:
+                table = table.cast(self._ecrivain.schema)
+            self._ecrivain.write_table(table, row_group_size=max(1, len(bloc)))
+            self._index[str(annee)] = len(self._index)
+        else:
+            if self._fichier is None:
+                # Fichier binaire : tell() donne des positions en octets
+                self._fichier = open(self.chemin, "wb")
+                bloc.iloc[:0].to_csv(self._fichier, index=False, encoding="utf-8")
+            debut = self._fichier.tell()
+            bloc.to_csv(self._fichier, index=False, header=False, encoding="utf-8")
+            self._index[str(annee)] = [debut, self._fichier.tell()]
+
+    def fermer(self) -> None:
+        if self._ecrivain is not None:
+            self._ecrivain.close()
+            self._ecrivain = None
+        if self._fichier is not None:
+            self._fichier.close()
+            self._fichier = None
+            with open(_chemin_index(self.chemin), "w", encoding="utf-8") as f:
+                json.dump(self._index, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+def lire_details(chemin, annees=None) -> pd.DataFrame:
+    """
+    Relit le détail écrit par EcrivainDetails.
+    Avec 'annees', seuls les blocs des années demandées sont lus.
+    """
+    chemin = Path(chemin)
+    selection = None if annees is None else {int(a) for a in annees}
+
+    if chemin.suffix == ".parquet":
+        fichier = pq.ParquetFile(chemin)
+        if selection is None:
+            return fichier.read().to_pandas()
+        colonne = fichier.schema_arrow.get_field_index("annee")
+        blocs = [i for i in range(fichier.num_row_groups)
+                 if fichier.metadata.row_group(i).column(colonne).statistics.min in selection]
+        return fichier.read_row_groups(blocs).to_pandas()
+
+    if selection is None:
+        return pd.read_csv(chemin)
+
+    with open(_chemin_index(chemin), "r", encoding="utf-8") as f:
+        index = json.load(f)
+    with open(chemin, "rb") as f:
+        morceaux = [f.readline()]  # en-tête
+        for annee in sorted(selection):
+            if str(annee) not in index:
+                continue
+            debut, fin = index[str(annee)]
+            f.seek(debut)
+            morceaux.append(f.read(fin - debut))
+    return pd.read_csv(BytesIO(b"".join(morceaux)), encoding="utf-8")
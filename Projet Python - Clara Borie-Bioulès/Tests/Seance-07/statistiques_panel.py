@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from parallele import matrice_pib_energie
+
+# ------------------------------------------------------------------
+# Statistiques PIB / énergie pour toutes les années en une passe
+# ------------------------------------------------------------------
+# Les matrices territoires x années sont traitées d'un bloc : le masque des
+# cellules valides (PIB et énergie renseignés) remplace le dropna de chaque
+# année, et toutes les sommes sont des réductions NumPy sur l'axe des
+# territoires.
+
+COLONNES_RESUME = [
+    "annee",
+    "nb_territoires",
+    "covariance_pib_energie",
+    "correlation_pearson",
+    "p_value_correlation",
+    "R2",
+    "pente_regression",
+    "intercept_regression",
+]
+
+
+def matrices_par_annee(df: pd.DataFrame, annees) -> tuple:
+    """
+    Retourne (annees_disponibles, PIB, Energie) : deux matrices float64
+    territoires x années (NaN pour les cellules vides ou non numériques).
+    """
+    matrice, indices, _ = matrice_pib_energie(df, annees)
+    annees_disponibles = np.array(list(indices), dtype=int)
+    return annees_disponibles, matrice[:, 0::2], matrice[:, 1::2]
+
+
+def statistiques_colonnes(x: np.ndarray, y: np.ndarray) -> dict:
+    """
+    Statistiques bivariées de chaque colonne de x et y (NaN = cellule absente) :
+    n, covariance, r de Pearson, p-value, R², pente et ordonnée à l'origine
+    de la régression y = a + b * x.
+    """
+    valide = ~np.isnan(x) & ~np.isnan(y)
+    n = valide.sum(axis=0)
+    x = np.where(valide, x, 0.0)
+    y = np.where(valide, y, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = x.sum(axis=0) / n
+        y_mean = y.sum(axis=0) / n
+        dx = np.where(valide, x - x_mean, 0.0)
+        dy = np.where(valide, y - y_mean, 0.0)
+        Sxx = (dx * dx).sum(axis=0)
+        Syy = (dy * dy).sum(axis=0)
+        Sxy = (dx * dy).sum(axis=0)
+
+        cov_xy = np.where(n >= 2, Sxy / (n - 1), np.nan)
+        corr = np.clip(Sxy / np.sqrt(Sxx * Syy), -1.0, 1.0)
+        slope = Sxy / Sxx
+        intercept = y_mean - slope * x_mean
+
+        # Même p-value que stats.pearsonr (test de Student à n - 2 ddl)
+        ddl = n - 2
+        t = corr * np.sqrt(ddl / ((1.0 - corr) * (1.0 + corr)))
+    p_val = np.where(np.abs(corr) == 1.0, 0.0, 2 * stats.t.sf(np.abs(t), ddl))
+
+    return {
+        "n": n,
+        "covariance": cov_xy,
+        "correlation_pearson": corr,
+        "p_value_correlation": p_val,
+        "R2": corr**2,
+        "pente_regression": slope,
+        "intercept_regression": intercept,
+    }
+
+
+def statistiques_par_annee(pib: np.ndarray, energie: np.ndarray, annees) -> pd.DataFrame:
+    """
+    Statistiques PIB / énergie de chaque colonne (année) des matrices
+    territoires x années, dans le format de resume_par_annee.csv.
+
+    Les années avec moins de deux territoires valides sont écartées.
+    """
+    res = statistiques_colonnes(pib, energie)
+    resume = pd.DataFrame({
+        "annee": np.asarray(annees, dtype=int),
+        "nb_territoires": res["n"],
+        "covariance_pib_energie": res["covariance"],
+        "correlation_pearson": res["correlation_pearson"],
+        "p_value_correlation": res["p_value_correlation"],
+        "R2": res["R2"],
+        "pente_regression": res["pente_regression"],
+        "intercept_regression": res["intercept_regression"],
+    }, columns=COLONNES_RESUME)
+    return resume[res["n"] >= 2].reset_index(drop=True)
+
+
+def resume_par_annee(df: pd.DataFrame, annees, matrices: tuple = None) -> pd.DataFrame:
+    """
+    Tableau de resume_par_annee.csv calculé sans boucle sur les années.
+    'matrices' : résultat de matrices_par_annee(df, annees) s'il est déjà calculé.
+    """
+    if matrices is None:
+        matrices = matrices_par_annee(df, annees)
+    annees_disponibles, pib, energie = matrices
+    return statistiques_par_annee(pib, energie, annees_disponibles)
+
+
+def details_par_annee(df: pd.DataFrame, annees, matrices: tuple = None):
+    """
+    Itère sur (annee, données de l'année) : territoires valides de l'année
+    avec les colonnes Nom_du_territoire, Code_ISO_du_territoire, PIB, Energie.
+    'matrices' : comme pour resume_par_annee.
+    """
+    if matrices is None:
+        matrices = matrices_par_annee(df, annees)
+    annees_disponibles, pib, energie = matrices
+    valide = ~np.isnan(pib) & ~np.isnan(energie)
+    noms = df["Nom_du_territoire"].to_numpy()
+    codes = df["Code_ISO_du_territoire"].to_numpy()
+
+    for j, annee in enumerate(annees_disponibles):
+        lignes = valide[:, j]
+        if not lignes.any():
+            continue
+        yield int(annee), pd.DataFrame({
+            "Nom_du_territoire": noms[lignes],
+            "Code_ISO_du_territoire": codes[lignes],
+            "PIB": pib[lignes, j],
+            "Energie": energie[lignes, j],
+        })
@@ -0,0 +1,295 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, svds
+
+# Chargeur commun (../chargement.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from chargement import ouvrirUnFichier
+
+# ------------------------------------------------------------
+# Analyse factorielle des correspondances (AFC)
+# ------------------------------------------------------------
+# Z = D_r^(-1/2) (P - r c^T) D_c^(-1/2) n'est jamais formée avec des
+# matrices diagonales : les poids sont appliqués par diffusion
+# (broadcasting). Pour un tableau creux ou très grand, Z n'est même pas
+# construite : on n'utilise que les produits Z X et Z^T Y, qui se
+# calculent à partir de P (creuse) et des marges :
+#     Z X   = D_r^(-1/2) P D_c^(-1/2) X - sqrt(r) (sqrt(c)^T X)
+#     Z^T Y = D_c^(-1/2) P^T D_r^(-1/2) Y - sqrt(c) (sqrt(r)^T Y)
+
+METHODES = ("auto", "complete", "tronquee", "aleatoire")
+
+# Résidu maximal accepté pour la SVD randomisée, relatif à la première
+# valeur singulière : max_j ||Z v_j - s_j u_j|| / s_1. Au-delà (spectre
+# trop plat pour que les itérations de puissance séparent les axes),
+# afc() refait le calcul avec svds.
+TOLERANCE_ALEATOIRE = 1e-6
+
+
+def _inverse_racine(m: np.ndarray) -> np.ndarray:
+    """1 / sqrt(m), avec 0 pour les marges nulles (lignes ou colonnes vides)."""
+    with np.errstate(divide="ignore"):
+        return np.where(m > 0, 1.0 / np.sqrt(m), 0.0)
+
+
+def marges(N) -> tuple:
+    """Retourne (n, r, c) : effectif total, masses des lignes et des colonnes."""
+    n_total = float(N.sum())
+    P = N / n_total
+    r = np.asarray(P.sum(axis=1)).ravel()
+    c = np.asarray(P.sum(axis=0)).ravel()
+    return n_total, r, c
+
+
+def inertie_totale(N, n_total=None, r=None, c=None) -> float:
+    """
+    Inertie totale (= chi2 / n) sans SVD complète :
+    somme de p_ij^2 / (r_i c_j) sur les cases non nulles, moins 1.
+    """
+    if n_total is None:
+        n_total, r, c = marges(N)
+    if sparse.issparse(N):
+        P = sparse.coo_matrix(N)
+        p = P.data / n_total
+        return float(np.sum(p * p / (r[P.row] * c[P.col])) - 1.0)
+    P = np.asarray(N, dtype=float) / n_total
+    with np.errstate(divide="ignore", invalid="ignore"):
+        termes = np.where(P > 0, P * P / (r[:, None] * c[None, :]), 0.0)
+    return float(termes.sum() - 1.0)
+
+
+def _orienter(V: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """
+    Signe de chaque axe (les vecteurs singuliers sont définis au signe près) :
+    la colonne de plus forte masse a une coordonnée positive (à défaut,
+    la colonne de plus grande coordonnée en valeur absolue).
+    """
+    signes = np.sign(V[np.argmax(c)])
+    secours = np.sign(V[np.argmax(np.abs(V), axis=0), np.arange(V.shape[1])])
+    signes = np.where(signes == 0, secours, signes)
+    return np.where(signes == 0, 1.0, signes)
+
+
+def _operateur(P, r, c) -> LinearOperator:
+    """Z vue comme opérateur linéaire (produits Z X et Z^T Y seulement)."""
+    ir, ic = _inverse_racine(r), _inverse_racine(c)
+    sr, sc = np.sqrt(r), np.sqrt(c)
+
+    def matmat(X):
+        X = np.asarray(X, dtype=float).reshape(len(c), -1)
+        return np.asarray(P @ (X * ic[:, None])) * ir[:, None] - np.outer(sr, sc @ X)
+
+    def rmatmat(Y):
+        Y = np.asarray(Y, dtype=float).reshape(len(r), -1)
+        return np.asarray(P.T @ (Y * ir[:, None])) * ic[:, None] - np.outer(sc, sr @ Y)
+
+    return LinearOperator(
+        (len(r), len(c)), dtype=float,
+        matvec=lambda x: matmat(x).ravel(), rmatvec=lambda y: rmatmat(y).ravel(),
+        matmat=matmat, rmatmat=rmatmat,
+    )
+
+
+def svd_aleatoire(Z: LinearOperator, k: int, surechantillonnage: int = None,
+                  iterations: int = 7, graine: int = 0) -> tuple:
+    """
+    SVD tronquée randomisée (Halko, Martinsson, Tropp) : k premières
+    valeurs singulières de Z à partir de quelques produits Z X / Z^T Y.
+    Par défaut, on suréchantillonne de max(10, k) vecteurs.
+    """
+    m, p = Z.shape
+    if surechantillonnage is None:
+        surechantillonnage = max(10, k)
+    l = min(k + surechantillonnage, m, p)
+    rng = np.random.default_rng(graine)
+
+    Q, _ = np.linalg.qr(Z.matmat(rng.standard_normal((p, l))))
+    for _ in range(iterations):
+        # Itérations de puissance (réorthogonalisées) pour séparer les axes proches
+        Q, _ = np.linalg.qr(Z.rmatmat(Q))
+        Q, _ = np.linalg.qr(Z.matmat(Q))
+
+    B = Z.rmatmat(Q).T  # B = Q^T Z, petite matrice l x p
+    Ub, s, Vt = np.linalg.svd(B, full_matrices=False)
+    return (Q @ Ub)[:, :k], s[:k], Vt[:k]
+
+
+def residu_svd(Z: LinearOperator, U: np.ndarray, s: np.ndarray, Vt: np.ndarray) -> float:
+    """
+    max_j ||Z v_j - s_j u_j|| / s_1 : nul (aux arrondis près) pour des
+    triplets singuliers exacts. Z^T u_j = s_j v_j est exact par construction
+    dans svd_aleatoire, seul Z v_j est donc vérifié.
+    """
+    if s.size == 0 or s[0] == 0:
+        return 0.0
+    return float(np.linalg.norm(Z.matmat(Vt.T) - U * s[None, :], axis=0).max() / s[0])
+
+
+def _svd_tronquee(Z: LinearOperator, k: int, graine: int) -> tuple:
+    """svds, axes rangés par valeur singulière décroissante."""
+    U, s, Vt = svds(Z, k=k, random_state=graine)
+    ordre = np.argsort(s)[::-1]
+    return U[:, ordre], s[ordre], Vt[ordre]
+
+
+def afc(N, k: int = None, methode: str = "auto", graine: int = 0) -> dict:
+    """
+    AFC d'un tableau de contingence N (tableau NumPy ou matrice scipy.sparse).
+
+    - k : nombre d'axes à calculer (None : tous les axes)
+    - methode :
+        "complete"  : SVD complète de Z (tableaux de taille modérée)
+        "tronquee"  : scipy.sparse.linalg.svds sur l'opérateur Z
+        "aleatoire" : SVD randomisée sur l'opérateur Z (approchée, plus
+                      rapide sur les très grands tableaux ; précise quand
+                      les valeurs propres décroissent vite). Si son résidu
+                      dépasse TOLERANCE_ALEATOIRE, repli sur "tronquee"
+        "auto"      : "complete" si Z tient sans peine en mémoire et
+                      k n'est pas fixé, sinon "tronquee" ("aleatoire"
+                      n'est jamais choisie d'office)
+
+    Retourne un dictionnaire : valeurs_propres, inertie_totale,
+    pourcentage_inertie, coord_lignes, coord_colonnes (coordonnées
+    factorielles sur les axes calculés).
+    """
+    if methode not in METHODES:
+        raise ValueError(f"Méthode inconnue : {methode} (attendu : {', '.join(METHODES)})")
+    creuse = sparse.issparse(N)
+    if not creuse:
+        N = np.asarray(N, dtype=float)
+    n_total, r, c = marges(N)
+    nb_axes_max = min(N.shape)
+
+    if methode == "auto":
+        petite = N.shape[0] * N.shape[1] <= 10_000_000
+        methode = "complete" if (k is None and petite) else "tronquee"
+    if methode == "complete":
+        P = (N.toarray() if creuse else N) / n_total
+        # Écarts au produit des marges, pondérés par diffusion (pas de np.diag)
+        Z = (P - r[:, None] * c[None, :]) * _inverse_racine(r)[:, None] * _inverse_racine(c)[None, :]
+        U, s, Vt = np.linalg.svd(Z, full_matrices=False)
+        inertie = float(np.sum(s**2))  # toutes les valeurs singulières, avant de garder les k premières
+        if k is not None:
+            U, s, Vt = U[:, :k], s[:k], Vt[:k]
+    else:
+        k = min(k or 2, nb_axes_max)
+        P = (N.tocsr() if creuse else N) / n_total
+        Z = _operateur(P, r, c)
+        if methode == "tronquee" and k < nb_axes_max:
+            U, s, Vt = _svd_tronquee(Z, k, graine)
+        else:
+            # Tous les axes (k = nb_axes_max, hors de portée de svds) : le
+            # sous-espace échantillonné est alors l'image entière de Z, la
+            # SVD randomisée est exacte
+            U, s, Vt = svd_aleatoire(Z, k, graine=graine)
+            if k < nb_axes_max and residu_svd(Z, U, s, Vt) > TOLERANCE_ALEATOIRE:
+                U, s, Vt = _svd_tronquee(Z, k, graine)
+        inertie = inertie_totale(N, n_total, r, c)
+
+    signes = _orienter(Vt.T, c)
+    U, Vt = U * signes[None, :], Vt * signes[:, None]
+
+    valeurs_propres = s**2
+    return {
+        "valeurs_propres": valeurs_propres,
+        "inertie_totale": inertie,
+        "pourcentage_inertie": 100 * valeurs_propres / inertie,
+        "coord_lignes": _inverse_racine(r)[:, None] * U * s[None, :],
+        "coord_colonnes": _inverse_racine(c)[:, None] * Vt.T * s[None, :],
+    }
+
+
+# ------------------------------------------------------------
+# AFC par blocs de lignes (tableaux plus grands que la mémoire)
+# ------------------------------------------------------------
+# Trois passes sur les blocs de lignes :
+#   1. marges : effectif total et totaux des colonnes (la masse d'une
+#      ligne ne dépend que de la ligne elle-même) ;
+#   2. Z^T Z, petite matrice colonnes x colonnes, accumulée bloc par bloc ;
+#      ses valeurs et vecteurs propres donnent les valeurs propres et les
+#      coordonnées des colonnes ;
+#   3. (coordonnees_lignes_par_blocs) projection des lignes sur les axes :
+#      F = D_r^(-1/2) Z V, bloc par bloc.
+# Seules les matrices colonnes x colonnes restent en mémoire.
+
+
+def blocs_csv(chemin_fichier, colonnes=None, taille_bloc: int = 1_000_000):
+    """
+    Retourne une fonction qui relit le CSV par blocs de lignes (tableaux
+    NumPy) à chaque appel : une lecture par passe de afc_par_blocs().
+    """
+    return lambda: ouvrirUnFichier(chemin_fichier, colonnes=colonnes,
+                                   taille_bloc=taille_bloc, sortie="numpy")
+
+
+def _bloc_centre(bloc, n_total, c, ic) -> tuple:
+    """Lignes de Z (et 1 / sqrt(r)) correspondant à un bloc de lignes de N."""
+    P = np.asarray(bloc, dtype=float) / n_total
+    r = P.sum(axis=1)
+    ir = _inverse_racine(r)
+    return (P - r[:, None] * c[None, :]) * ir[:, None] * ic[None, :], ir
+
+
+def afc_par_blocs(blocs, k: int = None) -> dict:
+    """
+    AFC d'un tableau de contingence lu par blocs de lignes.
+
+    blocs : fonction sans argument renvoyant un nouvel itérateur de blocs
+    (tableaux 2-D ou DataFrame), par exemple blocs_csv(chemin).
+
+    Retourne le même dictionnaire que afc() sans coord_lignes (voir
+    coordonnees_lignes_par_blocs), avec en plus n_total, masses_colonnes,
+    axes (vecteurs propres de Z^T Z) et nb_lignes.
+    """
+    # Passe 1 : marges
+    n_total, totaux, nb_lignes = 0.0, None, 0
+    for bloc in blocs():
+        bloc = np.asarray(bloc, dtype=float)
+        somme = bloc.sum(axis=0)
+        totaux = somme if totaux is None else totaux + somme
+        n_total += float(somme.sum())
+        nb_lignes += len(bloc)
+    if totaux is None or n_total <= 0:
+        raise ValueError("Tableau de contingence vide.")
+    c = totaux / n_total
+    ic = _inverse_racine(c)
+
+    # Passe 2 : Z^T Z
+    ZtZ = np.zeros((len(c), len(c)))
+    for bloc in blocs():
+        Z, _ = _bloc_centre(bloc, n_total, c, ic)
+        ZtZ += Z.T @ Z
+
+    valeurs, V = np.linalg.eigh(ZtZ)
+    ordre = np.argsort(valeurs)[::-1]
+    valeurs, V = np.clip(valeurs[ordre], 0.0, None), V[:, ordre]
+    V = V * _orienter(V, c)[None, :]
+    if k is not None:
+        valeurs, V = valeurs[:k], V[:, :k]
+    inertie = float(np.trace(ZtZ))
+
+    return {
+        "valeurs_propres": valeurs,
+        "inertie_totale": inertie,
+        "pourcentage_inertie": 100 * valeurs / inertie,
+        "coord_colonnes": ic[:, None] * V * np.sqrt(valeurs)[None, :],
+        "n_total": n_total,
+        "masses_colonnes": c,
+        "axes": V,
+        "nb_lignes": nb_lignes,
+    }
+
+
+def coordonnees_lignes_par_blocs(blocs, resultat: dict):
+    """
+    Passe 3 : génère les coordonnées factorielles des lignes, un tableau
+    (lignes du bloc x axes) par bloc, à partir du résultat de afc_par_blocs().
+    """
+    c = resultat["masses_colonnes"]
+    ic = _inverse_racine(c)
+    for bloc in blocs():
+        Z, ir = _bloc_centre(bloc, resultat["n_total"], c, ic)
+        yield ir[:, None] * (Z @ resultat["axes"])
@@ -0,0 +1,120 @@
+import numpy as np
+from scipy.stats import f as loi_f
+
+# ------------------------------------------------------------
+# ANOVA à un facteur à partir des statistiques suffisantes
+# ------------------------------------------------------------
+# Pour chaque groupe, il suffit de (n, somme, somme des carrés) :
+#     SC_inter = sum(S_g^2 / n_g) - T^2 / N
+#     SC_intra = sum(Q_g) - sum(S_g^2 / n_g)
+# Ces statistiques ont autant d'axes qu'on veut devant l'axe des groupes :
+# un seul calcul donne le F de milliers d'ensembles de groupes (ou de
+# rééchantillonnages). Les valeurs sont décalées (centrées sur la moyenne
+# générale) avant de sommer les carrés, pour éviter les pertes de précision :
+# F ne dépend pas de ce décalage.
+
+METHODES_REECHANTILLONNAGE = ("permutation", "bootstrap")
+
+
+def statistiques_suffisantes(groupes, decalage: float = None) -> tuple:
+    """
+    Retourne (n, somme, somme_carres) de chaque groupe (liste de tableaux 1-D),
+    calculés sur les valeurs - decalage (par défaut, la moyenne générale).
+    """
+    groupes = [np.asarray(g, dtype=float) for g in groupes]
+    if decalage is None:
+        decalage = np.mean(np.concatenate(groupes))
+    groupes = [g - decalage for g in groupes]
+    n = np.array([len(g) for g in groupes], dtype=float)
+    somme = np.array([g.sum() for g in groupes])
+    somme_carres = np.array([(g * g).sum() for g in groupes])
+    return n, somme, somme_carres
+
+
+def anova_statistiques(n, somme, somme_carres) -> dict:
+    """
+    ANOVA à un facteur à partir des statistiques suffisantes.
+
+    n, somme, somme_carres : tableaux (..., nb_groupes) ; les axes de tête
+    indexent les ensembles de groupes testés d'un coup.
+    Retourne F, p_value, ddl_inter, ddl_intra (de forme ...).
+    """
+    n = np.asarray(n, dtype=float)
+    somme = np.asarray(somme, dtype=float)
+    somme_carres = np.asarray(somme_carres, dtype=float)
+
+    N = n.sum(axis=-1)
+    k = (n > 0).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        part_groupes = np.where(n > 0, somme**2 / n, 0.0).sum(axis=-1)
+        sc_inter = part_groupes - somme.sum(axis=-1)**2 / N
+        sc_intra = np.maximum(somme_carres.sum(axis=-1) - part_groupes, 0.0)
+
+        ddl_inter = k - 1
+        ddl_intra = N - k
+        F = (sc_inter / ddl_inter) / (sc_intra / ddl_intra)
+
+    return {
+        "F": F,
+        "p_value": loi_f.sf(F, ddl_inter, ddl_intra),
+        "ddl_inter": ddl_inter,
+        "ddl_intra": ddl_intra,
+    }
+
+
+def anova_une_voie(*groupes) -> tuple:
+    """Même résultat que stats.f_oneway(*groupes) : (F, p_value)."""
+    res = anova_statistiques(*statistiques_suffisantes(groupes))
+    return float(res["F"]), float(res["p_value"])
+
+
+def anova_reechantillonnage(*groupes, nb_reechantillons: int = 9999, methode: str = "permutation",
+                            graine: int = 0, taille_lot: int = 1000) -> dict:
+    """
+    p-value de l'ANOVA par permutation ou par bootstrap.
+
+    - "permutation" : les étiquettes de groupe sont permutées ;
+    - "bootstrap" : chaque groupe est recentré sur sa moyenne (H0 imposée),
+      puis les valeurs sont tirées avec remise dans l'ensemble des groupes.
+
+    Les rééchantillonnages d'un lot forment une matrice d'indices
+    (taille_lot x N) : les sommes par groupe de tous les rééchantillonnages
+    sont obtenues d'un seul produit matriciel avec l'indicatrice des groupes.
+
+    Retourne F, p_value (loi de Fisher), p_value_reechantillonnage et
+    F_reechantillonnes.
+    """
+    if methode not in METHODES_REECHANTILLONNAGE:
+        raise ValueError(
+            f"Méthode inconnue : {methode} (attendu : {', '.join(METHODES_REECHANTILLONNAGE)})"
+        )
+    groupes = [np.asarray(g, dtype=float) for g in groupes]
+    valeurs = np.concatenate(groupes)
+    valeurs = valeurs - valeurs.mean()
+    codes = np.repeat(np.arange(len(groupes)), [len(g) for g in groupes])
+    indicatrice = (codes[:, None] == np.arange(len(groupes))[None, :]).astype(float)  # N x k
+    n = indicatrice.sum(axis=0)
+
+    observe = anova_statistiques(n, valeurs @ indicatrice, (valeurs * valeurs) @ indicatrice)
+    if methode == "bootstrap":
+        valeurs = valeurs - ((valeurs @ indicatrice) / n)[codes]
+
+    rng = np.random.default_rng(graine)
+    F_reech = np.empty(nb_reechantillons)
+    for debut in range(0, nb_reechantillons, taille_lot):
+        b = min(taille_lot, nb_reechantillons - debut)
+        if methode == "permutation":
+            indices = rng.permuted(np.broadcast_to(np.arange(len(valeurs)), (b, len(valeurs))), axis=1)
+        else:
+            indices = rng.integers(0, len(valeurs), size=(b, len(valeurs)))
+        tirage = valeurs[indices]  # b x N
+        F_reech[debut:debut + b] = anova_statistiques(
+            n, tirage @ indicatrice, (tirage * tirage) @ indicatrice
+        )["F"]
+
+    return {
+        "F": float(observe["F"]),
+        "p_value": float(observe["p_value"]),
+        "p_value_reechantillonnage": (1 + np.sum(F_reech >= observe["F"])) / (nb_reechantillons + 1),
+        "F_reechantillonnes": F_reech,
+    }
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2 as loi_chi2
+
+# ------------------------------------------------------------
+# Test du chi2 d'indépendance sur une pile de tableaux de contingence
+# ------------------------------------------------------------
+# Au lieu d'appeler chi2_contingency sur chaque tableau (une région x année
+# à la fois), les tableaux sont empilés dans un tableau 3-D
+# (nb_tableaux, nb_lignes, nb_colonnes) : marges, effectifs théoriques,
+# chi2, ddl, p-values et phi2 sont calculés en une fois, avec un seul
+# appel vectorisé à chi2.sf.
+#
+# Les lignes ou colonnes vides (marge nulle) ne comptent pas : on peut
+# donc compléter par des zéros des tableaux de tailles différentes.
+
+ALPHA = 0.05
+
+# Modèles de conclusion, complétés par le seuil et les noms des deux variables
+CONCLUSIONS = (
+    "On ne rejette pas l'hypothèse d'indépendance : aucune liaison significative détectée au seuil de {alpha:.0%}.",
+    "On rejette l'hypothèse d'indépendance : il existe une liaison entre {ligne} et {colonne}.",
+)
+
+
+def empiler_tableaux(df: pd.DataFrame, cles, ligne: str, colonne: str, effectif: str) -> tuple:
+    """
+    Construit la pile de tableaux à partir d'un tableau long (une ligne par
+    clé x modalité ligne x modalité colonne, ex. région, année, catégorie, sexe).
+
+    Retourne (tableaux, index_des_cles, modalites_lignes, modalites_colonnes).
+    Les cases absentes valent 0.
+    """
+    cles = [cles] if isinstance(cles, str) else list(cles)
+    code_cle, index_cles = pd.MultiIndex.from_frame(df[cles]).factorize()
+    index_cles = index_cles.set_names(cles)
+    code_ligne, modalites_lignes = pd.factorize(df[ligne])
+    code_colonne, modalites_colonnes = pd.factorize(df[colonne])
+
+    tableaux = np.zeros((len(index_cles), len(modalites_lignes), len(modalites_colonnes)))
+    np.add.at(tableaux, (code_cle, code_ligne, code_colonne), df[effectif].to_numpy(dtype=float))
+    return tableaux, index_cles, modalites_lignes, modalites_colonnes
+
+
+def chi2_par_lot(tableaux, correction: bool = True) -> dict:
+    """
+    Test du chi2 d'indépendance de chaque tableau d'une pile 3-D
+    (un tableau 2-D est traité comme une pile d'un seul tableau).
+
+    Mêmes résultats que scipy.stats.chi2_contingency, tableau par tableau
+    (avec correction=True, correction de Yates pour les tableaux à 1 ddl).
+
+    Retourne un dictionnaire de tableaux 1-D : n_total, chi2, ddl, p_value,
+    phi2, et les effectifs théoriques (même forme que la pile).
+    Un tableau sans aucun ddl (une seule ligne ou colonne non vide, ou aucun
+    effectif) a un chi2 et une p-value NaN.
+    """
+    O = np.asarray(tableaux, dtype=float)
+    if O.ndim == 2:
+        O = O[None]
+    if O.ndim != 3:
+        raise ValueError(f"Pile de tableaux attendue en 3-D, reçu {O.ndim} dimension(s).")
+    if (O < 0).any():
+        raise ValueError("Les effectifs doivent être positifs ou nuls.")
+
+    marges_lignes = O.sum(axis=2)                 # (t, l)
+    marges_colonnes = O.sum(axis=1)               # (t, c)
+    n = marges_lignes.sum(axis=1)                 # (t,)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        E = marges_lignes[:, :, None] * marges_colonnes[:, None, :] / n[:, None, None]
+        # Lignes et colonnes non vides seulement ; un tableau vide (n_total = 0) a 0 ddl
+        ddl = np.maximum((marges_lignes > 0).sum(axis=1) - 1, 0) * np.maximum((marges_colonnes > 0).sum(axis=1) - 1, 0)
+
+        ecart = O - E
+        if correction:
+            # Correction de Yates (comme chi2_contingency) pour les tableaux à 1 ddl
+            yates = (ddl == 1)[:, None, None]
+            ecart = np.where(yates, np.sign(ecart) * (np.abs(ecart) - np.minimum(0.5, np.abs(ecart))), ecart)
+        termes = np.where(E > 0, ecart**2 / E, 0.0)
+        chi2 = np.where(ddl > 0, termes.sum(axis=(1, 2)), np.nan)
+        phi2 = chi2 / n
+
+    p_value = loi_chi2.sf(chi2, np.maximum(ddl, 1))
+    return {
+        "n_total": n,
+        "chi2": chi2,
+        "ddl": ddl,
+        "p_value": p_value,
+        "phi2": phi2,
+        "effectifs_theoriques": E,
+    }
+
+
+def resultats_chi2(resultats: dict, index=None, alpha: float = ALPHA,
+                   variables: tuple = ("lignes", "colonnes")) -> pd.DataFrame:
+    """
+    Tableau des résultats (une ligne par tableau de contingence), avec la
+    conclusion du test au seuil alpha. 'index' : clés des tableaux
+    (ex. MultiIndex région x année renvoyé par empiler_tableaux).
+    'variables' : noms des variables en ligne et en colonne, repris dans
+    la conclusion (ex. ("catégorie socioprofessionnelle", "sexe")).
+    """
+    ligne, colonne = variables
+    conclusions = [modele.format(alpha=alpha, ligne=ligne, colonne=colonne) for modele in CONCLUSIONS]
+    rejet = resultats["p_value"] < alpha
+    tableau = pd.DataFrame({
+        "n_total": resultats["n_total"].astype(int),
+        "chi2": resultats["chi2"],
+        "ddl": resultats["ddl"],
+        "p_value": resultats["p_value"],
+        "phi2": resultats["phi2"],
+        "conclusion": np.where(rejet, conclusions[1], conclusions[0]),
+    })
+    if index is not None:
+        tableau.index = index
+        tableau = tableau.reset_index()
+    return tableau
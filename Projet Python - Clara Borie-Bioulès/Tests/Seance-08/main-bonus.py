@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from scipy import stats
+
+from afc import afc, afc_par_blocs, blocs_csv
+from anova import anova_reechantillonnage, anova_une_voie
 
 # ------------------------------------------------------------
 # Paramètres
@@ -11,6 +13,16 @@ OUT_ANOVA = Path("./data/resultats_anova_echantillons.csv")
 OUT_AFC_COORD = Path("./data/resultats_afc_coordonnees.csv")
 OUT_AFC_EIG = Path("./data/resultats_afc_valeurs_propres.csv")
 
+# p-value de l'ANOVA par rééchantillonnage ("permutation" ou "bootstrap"),
+# ajoutée au résumé si NB_REECHANTILLONNAGES > 0
+NB_REECHANTILLONNAGES = 0
+METHODE_REECHANTILLONNAGE = "permutation"
+
+# AFC par blocs de lignes (fichiers trop gros pour la mémoire) :
+# le CSV est relu par blocs de TAILLE_BLOC_AFC lignes au lieu de df.values
+AFC_PAR_BLOCS = False
+TAILLE_BLOC_AFC = 1_000_000
+
 # ------------------------------------------------------------
 # Chargement des données
 # ------------------------------------------------------------
@@ -33,12 +45,21 @@ print("Contre :", df["Contre"].describe())
 print("Sans opinion :", df["Sans opinion"].describe())
 
 # ANOVA une voie (H0 : mêmes moyennes dans les 3 groupes)
-F_stat, p_value = stats.f_oneway(pour, contre, sans)
+# (anova.py : calcul à partir de n, somme et somme des carrés de chaque groupe)
+F_stat, p_value = anova_une_voie(pour, contre, sans)
 
 print("\nANOVA une voie (Pour vs Contre vs Sans opinion) :")
 print(f"  F = {F_stat:.4f}")
 print(f"  p-value = {p_value:.4e}")
 
+if NB_REECHANTILLONNAGES > 0:
+    reech = anova_reechantillonnage(
+        pour, contre, sans,
+        nb_reechantillons=NB_REECHANTILLONNAGES, methode=METHODE_REECHANTILLONNAGE,
+    )
+    p_value_reech = reech["p_value_reechantillonnage"]
+    print(f"  p-value ({METHODE_REECHANTILLONNAGE}, {NB_REECHANTILLONNAGES} tirages) = {p_value_reech:.4e}")
+
 alpha = 0.05
 if p_value < alpha:
     conclusion_anova = (
@@ -61,6 +82,8 @@ df_anova = pd.DataFrame(
         "conclusion": [conclusion_anova],
     }
 )
+if NB_REECHANTILLONNAGES > 0:
+    df_anova.insert(2, f"p_value_{METHODE_REECHANTILLONNAGE}", [p_value_reech])
 df_anova.to_csv(OUT_ANOVA, index=False)
 
 # ------------------------------------------------------------
@@ -82,40 +105,27 @@ print(tableau)
 # (100 lignes, 3 colonnes), ce qui revient à faire une AFC sur df lui-même.
 
 # Table de contingence pour AFC : 100 x 3
-N = df.values
-n_total = N.sum()
-
-# Fréquences relatives
-P = N / n_total
-
-# Profils lignes et colonnes
-r = P.sum(axis=1, keepdims=True)   # masses lignes
-c = P.sum(axis=0, keepdims=True)   # masses colonnes
-
-# Matrice des écarts au produit des marges
-expected = r @ c                   # produit externe
-S = P - expected                   # écarts
-
-# Matrice centrée et pondérée (méthode du khi-deux)
-D_r_inv_sqrt = np.diag(1.0 / np.sqrt(r.flatten()))
-D_c_inv_sqrt = np.diag(1.0 / np.sqrt(c.flatten()))
-Z = D_r_inv_sqrt @ S @ D_c_inv_sqrt
-
-# Décomposition en valeurs singulières
-U, singular_values, Vt = np.linalg.svd(Z, full_matrices=False)
+# (afc.py : poids appliqués par diffusion, sans matrices diagonales ; accepte
+# aussi un tableau scipy.sparse et une SVD tronquée pour les grands tableaux)
+if AFC_PAR_BLOCS:
+    resultat_afc = afc_par_blocs(
+        blocs_csv(DATA_PATH, colonnes=["Pour", "Contre", "Sans opinion"], taille_bloc=TAILLE_BLOC_AFC)
+    )
+else:
+    N = df.values
+    resultat_afc = afc(N)
 
-eigenvalues = singular_values**2   # valeurs propres (inerties partielles)
+eigenvalues = resultat_afc["valeurs_propres"]   # valeurs propres (inerties partielles)
 
 # Coordonnées factorielles des colonnes (positions Pour/Contre/Sans opinion)
 # sur les deux premiers axes
-F_col = D_c_inv_sqrt @ Vt.T @ np.diag(singular_values)
-coord_col = F_col[:, :2]  # 2 premiers axes
+coord_col = resultat_afc["coord_colonnes"][:, :2]
 
 df_eig = pd.DataFrame(
     {
         "axe": np.arange(1, len(eigenvalues) + 1),
         "valeur_propre": eigenvalues,
-        "pourcentage_inertie": 100 * eigenvalues / eigenvalues.sum(),
+        "pourcentage_inertie": resultat_afc["pourcentage_inertie"],
     }
 )
 df_eig.to_csv(OUT_AFC_EIG, index=False)
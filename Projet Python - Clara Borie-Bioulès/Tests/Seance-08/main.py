@@ -2,7 +2,8 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from scipy.stats import chi2_contingency
+
+from chi2_lot import chi2_par_lot, empiler_tableaux, resultats_chi2
 
 # ------------------------------------------------------------
 # Paramètres
@@ -10,6 +11,15 @@ from scipy.stats import chi2_contingency
 DATA_PATH = Path("./data/Socioprofessionnelle-vs-sexe.csv")
 OUTPUT_RESUME = Path("./data/resultats_chi2_socioprofessionnelle_sexe.csv")
 
+# Plusieurs tableaux : fichier long avec une ligne par clé x catégorie
+# (ex. colonnes Region, Annee, Catégorie, Femmes, Hommes).
+# Avec None, les tableaux sont tirés de DATA_PATH : un tableau 2x2 par
+# catégorie (la catégorie / toutes les autres, par sexe).
+# Tous les tests sont faits d'un coup et écrits dans un seul fichier.
+DATA_PATH_LOT = None
+CLES_LOT = ["Region", "Annee"]
+OUTPUT_LOT = Path("./data/resultats_chi2_par_tableau.csv")
+
 # ------------------------------------------------------------
 # Fonctions locales pour les marges
 # ------------------------------------------------------------
@@ -67,7 +77,10 @@ else:
 # ------------------------------------------------------------
 # 3. Test d'indépendance du chi2
 # ------------------------------------------------------------
-chi2, p_value, dof, expected = chi2_contingency(contingence)
+# (chi2_lot.py : mêmes résultats que chi2_contingency, pour une pile de tableaux)
+test = chi2_par_lot(contingence)
+chi2, p_value, dof = test["chi2"][0], test["p_value"][0], int(test["ddl"][0])
+expected = test["effectifs_theoriques"][0]
 
 print("\nTest du chi2 d'indépendance :")
 print(f"  Chi2 = {chi2:.4f}")
@@ -75,18 +88,16 @@ print(f"  ddl  = {dof}")
 print(f"  p-value = {p_value:.4e}")
 
 alpha = 0.05
-if p_value < alpha:
-    conclusion = "On rejette l'hypothèse d'indépendance : il existe une liaison entre catégorie socioprofessionnelle et sexe."
-else:
-    conclusion = "On ne rejette pas l'hypothèse d'indépendance : aucune liaison significative détectée au seuil de 5%."
+df_resume = resultats_chi2(test, alpha=alpha, variables=("catégorie socioprofessionnelle", "sexe"))
+conclusion = df_resume["conclusion"].iloc[0]
 
 print("  Conclusion :", conclusion)
 
 # ------------------------------------------------------------
 # 4. Intensité de liaison phi2 de Pearson
 # ------------------------------------------------------------
-n = contingence.sum()
-phi2 = chi2 / n
+n = test["n_total"][0]
+phi2 = test["phi2"][0]
 
 print(f"\nIntensité de liaison phi^2 de Pearson : {phi2:.4f}")
 
@@ -97,16 +108,27 @@ print(f"\nIntensité de liaison phi^2 de Pearson : {phi2:.4f}")
 # ------------------------------------------------------------
 # 5. Sauvegarde d'un résumé des résultats
 # ------------------------------------------------------------
-resume = {
-    "n_total": [int(n)],
-    "chi2": [chi2],
-    "ddl": [dof],
-    "p_value": [p_value],
-    "phi2": [phi2],
-    "conclusion": [conclusion],
-}
-
-df_resume = pd.DataFrame(resume)
 df_resume.to_csv(OUTPUT_RESUME, index=False)
 
 print(f"\nRésumé des résultats sauvegardé dans : {OUTPUT_RESUME}")
+
+# ------------------------------------------------------------
+# 6. Plusieurs tableaux de contingence
+# ------------------------------------------------------------
+if DATA_PATH_LOT is not None:
+    df_lot = pd.read_csv(DATA_PATH_LOT).melt(
+        id_vars=CLES_LOT + ["Catégorie"], value_vars=modalites_sexe,
+        var_name="Sexe", value_name="Effectif",
+    )
+    tableaux, cles, _, _ = empiler_tableaux(df_lot, CLES_LOT, "Catégorie", "Sexe", "Effectif")
+    variables = ("catégorie socioprofessionnelle", "sexe")
+else:
+    # Ligne 0 : la catégorie ; ligne 1 : toutes les autres catégories
+    tableaux = np.stack([contingence, marges_colonnes - contingence], axis=1)
+    cles = pd.Index(categories, name="Catégorie")
+    variables = ("appartenance à la catégorie", "sexe")
+
+df_lot_resume = resultats_chi2(chi2_par_lot(tableaux), index=cles, alpha=alpha, variables=variables)
+df_lot_resume.to_csv(OUTPUT_LOT, index=False)
+
+print(f"\n{len(df_lot_resume)} tableaux testés, résultats sauvegardés dans : {OUTPUT_LOT}")
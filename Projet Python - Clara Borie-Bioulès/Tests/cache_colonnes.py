@@ -0,0 +1,168 @@
+# fichier : src/cache_colonnes.py
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow absent : repli sur le format .npz de NumPy
+    feather = None
+
+# ------------------------------------------------------------------
+# Cache binaire en colonnes pour les fichiers CSV de data/
+# ------------------------------------------------------------------
+# Chaque CSV est converti une seule fois (types déjà résolus) puis relu
+# depuis le cache tant que son contenu n'a pas changé.
+#
+# Clé du cache : empreinte SHA-256 du fichier + options de lecture.
+# Un petit fichier par CSV (<nom>-<clé du chemin>.empreinte.json) mémorise
+# la date de modification et la taille du CSV : si elles n'ont pas bougé,
+# le fichier n'est même pas relu pour recalculer son empreinte. Un fichier
+# par entrée (plutôt qu'un index commun) : deux processus qui lisent des
+# CSV différents n'écrasent jamais l'entrée de l'autre.
+
+FORMATS = ("feather", "parquet", "npz")
+DOSSIER_CACHE = ".cache"
+VERSION_CACHE = 2  # fait partie de la clé : à incrémenter si le contenu des fichiers de cache change
+
+
+def _empreinte_fichier(chemin: Path, taille_bloc: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(chemin, "rb") as f:
+        for bloc in iter(lambda: f.read(taille_bloc), b""):
+            h.update(bloc)
+    return h.hexdigest()
+
+
+def _chemin_entree(dossier: Path, chemin: Path) -> Path:
+    cle = hashlib.sha256(str(chemin).encode("utf-8")).hexdigest()[:20]
+    return dossier / f"{chemin.stem}-{cle}.empreinte.json"
+
+
+def _lire_entree(dossier: Path, chemin: Path) -> dict:
+    chemin_entree = _chemin_entree(dossier, chemin)
+    if not chemin_entree.exists():
+        return {}
+    with open(chemin_entree, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _ecrire_entree(dossier: Path, chemin: Path, entree: dict) -> None:
+    # Écriture dans un fichier temporaire (propre au processus) puis remplacement :
+    # pas d'entrée à moitié écrite, même si plusieurs processus lisent le même CSV
+    chemin_entree = _chemin_entree(dossier, chemin)
+    temporaire = chemin_entree.with_name(f"{chemin_entree.name}.{os.getpid()}.tmp")
+    with open(temporaire, "w", encoding="utf-8") as f:
+        json.dump(entree, f, ensure_ascii=False, indent=1)
+    os.replace(temporaire, chemin_entree)
+
+
+def empreinte(chemin, dossier_cache=None) -> str:
+    """
+    Empreinte SHA-256 du fichier, recalculée seulement si sa date de
+    modification (mtime) ou sa taille ont changé depuis le dernier passage.
+    """
+    chemin = Path(chemin).resolve()
+    dossier = Path(dossier_cache) if dossier_cache else chemin.parent / DOSSIER_CACHE
+    dossier.mkdir(parents=True, exist_ok=True)
+
+    etat = os.stat(chemin)
+    entree = _lire_entree(dossier, chemin)
+    if entree and entree["mtime_ns"] == etat.st_mtime_ns and entree["taille"] == etat.st_size:
+        return entree["empreinte"]
+
+    valeur = _empreinte_fichier(chemin)
+    _ecrire_entree(dossier, chemin, {"chemin": str(chemin), "mtime_ns": etat.st_mtime_ns,
+                                     "taille": etat.st_size, "empreinte": valeur})
+    return valeur
+
+
+def format_par_defaut() -> str:
+    """Feather (lecture en mémoire projetée) si pyarrow est installé, sinon npz."""
+    return "feather" if feather is not None else "npz"
+
+
+def _ecrire(df: pd.DataFrame, chemin: Path, fmt: str) -> None:
+    temporaire = chemin.with_name(f"{chemin.name}.{os.getpid()}.tmp")
+    if fmt == "feather":
+        feather.write_feather(df.reset_index(drop=True), temporaire, compression="uncompressed")
+    elif fmt == "parquet":
+        df.to_parquet(temporaire, index=False)
+    else:
+        colonnes = {}
+        for i, c in enumerate(df.columns):
+            valeurs = df[c].to_numpy()
+            if valeurs.dtype == object:
+                # Texte : chaînes de largeur fixe + masque des valeurs manquantes (pas de pickle)
+                manquantes = pd.isna(valeurs)
+                if not all(isinstance(v, str) for v in valeurs[~manquantes]):
+                    # Sinon les nombres d'une colonne mixte reviendraient en chaînes
+                    raise TypeError(f"Colonne {c!r} : types mélangés, non représentable en npz "
+                                    "(utiliser le format feather ou parquet).")
+                colonnes[f"m{i}"] = manquantes
+                valeurs = np.where(manquantes, "", valeurs).astype(str)
+            colonnes[f"c{i}"] = valeurs
+        with open(temporaire, "wb") as f:
+            np.savez(f, __colonnes__=np.array(df.columns, dtype=str), **colonnes)
+    os.replace(temporaire, chemin)
+
+
+def _lire(chemin: Path, fmt: str) -> pd.DataFrame:
+    if fmt == "feather":
+        # Fichier non compressé : pyarrow projette le fichier en mémoire (mmap)
+        return feather.read_feather(chemin, memory_map=True)
+    if fmt == "parquet":
+        return pd.read_parquet(chemin, memory_map=True)
+    with np.load(chemin, allow_pickle=False) as archive:
+        noms = archive["__colonnes__"].tolist()
+        return pd.DataFrame({nom: _colonne_npz(archive, i) for i, nom in enumerate(noms)})
+
+
+def _colonne_npz(archive, i: int) -> np.ndarray:
+    """Colonne i d'une archive npz ; texte rendu en objets, NaN aux valeurs manquantes."""
+    valeurs = archive[f"c{i}"]
+    if f"m{i}" not in archive.files:
+        return valeurs
+    valeurs = valeurs.astype(object)
+    valeurs[archive[f"m{i}"]] = np.nan
+    return valeurs
+
+
+def lire_csv_avec_cache(chemin_fichier, colonnes=None, types=None, sep=",",
+                        dossier_cache=None, fmt=None) -> pd.DataFrame:
+    """
+    Lit un CSV en passant par le cache binaire.
+
+    - colonnes, types, sep : mêmes options que ouvrirUnFichier()
+    - dossier_cache : par défaut, un dossier '.cache' à côté du CSV
+    - fmt : "feather", "parquet" ou "npz" (par défaut : format_par_defaut())
+
+    Au premier appel (ou si le CSV a changé), le CSV est analysé puis
+    enregistré dans le cache ; les appels suivants relisent le cache.
+    """
+    fmt = fmt or format_par_defaut()
+    if fmt not in FORMATS:
+        raise ValueError(f"Format de cache inconnu : {fmt} (attendu : {', '.join(FORMATS)})")
+    if fmt in ("feather", "parquet") and feather is None:
+        raise ImportError(f"Le format {fmt} nécessite pyarrow.")
+
+    chemin = Path(chemin_fichier).resolve()
+    dossier = Path(dossier_cache) if dossier_cache else chemin.parent / DOSSIER_CACHE
+
+    # Les options de lecture font partie de la clé : deux sélections de colonnes
+    # différentes donnent deux fichiers de cache différents
+    options = json.dumps([colonnes, types, sep, VERSION_CACHE], sort_keys=True, default=str)
+    cle = hashlib.sha256((empreinte(chemin, dossier) + options).encode("utf-8")).hexdigest()[:20]
+    chemin_cache = dossier / f"{chemin.stem}-{cle}.{fmt}"
+
+    if chemin_cache.exists():
+        return _lire(chemin_cache, fmt)
+
+    df = pd.read_csv(chemin, usecols=colonnes, dtype=types, sep=sep, low_memory=False)
+    _ecrire(df, chemin_cache, fmt)
+    return df
@@ -0,0 +1,88 @@
+# fichier : src/chargement.py
+
+import csv
+import os
+from itertools import islice
+
+import pandas as pd
+
+from cache_colonnes import lire_csv_avec_cache
+
+# ------------------------------------------------------------------
+# Chargeur commun à toutes les séances
+# ------------------------------------------------------------------
+# Depuis un dossier Seance-XX :
+#     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+#     from chargement import ouvrirUnFichier
+
+SORTIES = ("pandas", "numpy", "lignes")
+
+
+def _lire_lignes(chemin_fichier, colonnes, taille_bloc, sep):
+    """Lit le fichier avec csv.reader et renvoie des blocs de lignes (listes de chaînes)."""
+    with open(chemin_fichier, "r", encoding="utf-8", newline="") as f:
+        lecteur = csv.reader(f, delimiter=sep)
+        entete = next(lecteur)  # saute la première ligne (en-tête)
+
+        if colonnes is not None:
+            indices = [entete.index(c) for c in colonnes]
+            lecteur = ([row[i] for i in indices] for row in lecteur)
+
+        while True:
+            bloc = list(islice(lecteur, taille_bloc))
+            if not bloc:
+                return
+            yield bloc
+
+
+def ouvrirUnFichier(chemin_fichier, colonnes=None, types=None, taille_bloc=None,
+                    sortie="pandas", sep=",", cache=False):
+    """
+    Ouvre un fichier CSV (chemin + nom du fichier).
+
+    - colonnes : liste des colonnes à lire ; les autres ne sont jamais chargées
+    - types : type unique ou dictionnaire {colonne: type} déclaré à l'avance
+      (évite à pandas de deviner le type sur tout le fichier)
+    - taille_bloc : None pour lire tout le fichier d'un coup, sinon le nombre
+      de lignes par bloc : la fonction renvoie alors un itérateur de blocs
+    - sortie : "pandas" (DataFrame), "numpy" (tableau 2-D) ou "lignes"
+      (listes de chaînes sans l'en-tête, comme csv.reader)
+    - cache : True pour passer par le cache binaire en colonnes
+      (cache_colonnes.py) au lieu de réanalyser le texte du CSV ;
+      le cache se relit en entier, il exclut donc taille_bloc
+
+    Sans taille_bloc, renvoie un seul objet (DataFrame, tableau ou liste de lignes).
+    """
+    if not os.path.exists(chemin_fichier):
+        raise FileNotFoundError(f"Fichier introuvable : {chemin_fichier}")
+    if sortie not in SORTIES:
+        raise ValueError(f"Sortie inconnue : {sortie} (attendu : {', '.join(SORTIES)})")
+    if cache and taille_bloc is not None:
+        raise ValueError("cache=True relit tout le fichier : incompatible avec taille_bloc.")
+
+    if sortie == "lignes":
+        if taille_bloc is None:
+            return [row for bloc in _lire_lignes(chemin_fichier, colonnes, 10_000, sep) for row in bloc]
+        return _lire_lignes(chemin_fichier, colonnes, taille_bloc, sep)
+
+    options = {"usecols": colonnes, "dtype": types, "sep": sep}
+
+    def mettre_en_forme(df):
+        # usecols garde l'ordre du fichier : on remet celui demandé
+        if colonnes is not None:
+            df = df[list(colonnes)]
+        return df.to_numpy() if sortie == "numpy" else df
+
+    if cache:
+        return mettre_en_forme(lire_csv_avec_cache(chemin_fichier, colonnes=colonnes, types=types, sep=sep))
+
+    if taille_bloc is None:
+        # low_memory=False pour éviter le warning de typage mixte
+        return mettre_en_forme(pd.read_csv(chemin_fichier, low_memory=False, **options))
+
+    def blocs():
+        with pd.read_csv(chemin_fichier, chunksize=taille_bloc, **options) as lecteur:
+            for bloc in lecteur:
+                yield mettre_en_forme(bloc)
+
+    return blocs()
@@ -0,0 +1,41 @@
+# fichier : src/processus.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+
+# ------------------------------------------------------------------
+# Pool de processus commun à toutes les séances
+# ------------------------------------------------------------------
+# Méthode de démarrage : "fork" quand elle existe (Linux), les processus
+# démarrent alors sans réimporter le script principal ; sinon "spawn"
+# (Windows, macOS par défaut), qui réimporte le script dans chaque processus.
+# Les scripts qui lancent un pool doivent donc garder leur code principal
+# sous if __name__ == "__main__":.
+#
+# Depuis un dossier Seance-XX :
+#     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+#     from processus import executer_en_parallele
+
+
+def contexte_processus():
+    """Contexte multiprocessing : "fork" si disponible, sinon "spawn"."""
+    return get_context("fork" if "fork" in get_all_start_methods() else "spawn")
+
+
+def executer_en_parallele(fonction, taches, nb_travailleurs=None, chunksize=1, **options):
+    """
+    [fonction(t) for t in taches], dans un pool de nb_travailleurs processus
+    (None : un par cœur ; 1, ou une seule tâche : dans le processus courant).
+
+    Les résultats sont renvoyés dans l'ordre des tâches. options est passé
+    à ProcessPoolExecutor (initializer, initargs...).
+    """
+    taches = list(taches)
+    nb_travailleurs = nb_travailleurs or os.cpu_count() or 1
+    if nb_travailleurs == 1 or len(taches) <= 1:
+        if "initializer" in options:
+            options["initializer"](*options.get("initargs", ()))
+        return [fonction(t) for t in taches]
+    with ProcessPoolExecutor(max_workers=nb_travailleurs, mp_context=contexte_processus(), **options) as executeur:
+        return list(executeur.map(fonction, taches, chunksize=chunksize))